@@ -0,0 +1,139 @@
+"""
+Gary - SolarVox
+Sliding-window anti-spam tracking
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+"""
+
+import time
+from array import array
+from collections import OrderedDict
+
+FLOOD = "message flood"
+DUPLICATES = "repeated messages"
+MENTIONS = "mass mentions"
+
+
+class UserWindow:
+    """A user's last few messages as one flat ring of int64s.
+
+    Each slot holds ``(time in ms, content hash, mention count)``, so a
+    tracked user costs one small object and one array whatever their
+    history.
+    """
+
+    __slots__ = ("ring", "head", "size", "last_seen")
+
+    def __init__(self, capacity):
+        self.ring = array("q", bytes(24 * capacity))
+        self.head = 0
+        self.size = 0
+        self.last_seen = 0
+
+
+class SpamTracker:
+    """Per-guild sliding windows of recent messages, keyed by user.
+
+    ``check()`` records a message and returns why it counts as spam, or None:
+
+    - ``messages`` messages within ``window`` seconds
+    - ``duplicates`` messages with the same text within the window
+    - ``mentions`` user or role mentions within the window
+
+    Only the last ``max(messages, duplicates)`` messages are kept per user.
+    Users are held in least-recently-seen order; anyone idle for
+    ``idle_after`` seconds, or past ``max_users`` in a guild, is dropped as
+    new messages come in (and by ``sweep()`` for guilds that went quiet), so
+    memory follows active chatters, not guild size.
+    """
+
+    def __init__(self, messages=5, duplicates=3, mentions=10, window=5.0,
+                 idle_after=300.0, max_users=5000, clock=time.monotonic):
+        self.messages = messages
+        self.duplicates = duplicates
+        self.mentions = mentions
+        self.window_ms = int(window * 1000)
+        self.idle_ms = int(idle_after * 1000)
+        self.max_users = max_users
+        self.capacity = max(messages, duplicates, 1)
+        self.clock = clock
+        self._guilds = {}
+
+    def __len__(self):
+        return sum(len(users) for users in self._guilds.values())
+
+    def check(self, guild_id, user_id, content, mentions=0):
+        now = int(self.clock() * 1000)
+        since = now - self.window_ms
+        users = self._guilds.get(guild_id)
+        if users is None:
+            users = self._guilds[guild_id] = OrderedDict()
+        user = users.get(user_id)
+        if user is None:
+            self._evict(users, now, room=1)
+            user = users[user_id] = UserWindow(self.capacity)
+            quiet = True
+        else:
+            users.move_to_end(user_id)
+            quiet = user.last_seen <= since
+        user.last_seen = now
+
+        content_hash = hash(content) if content else 0
+        ring, capacity = user.ring, self.capacity
+        base = user.head * 3
+        ring[base] = now
+        ring[base + 1] = content_hash
+        ring[base + 2] = mentions
+        user.head = (user.head + 1) % capacity
+        if user.size < capacity:
+            user.size += 1
+
+        if quiet:
+            # Nothing older is inside the window (the usual case), so skip the scan.
+            recent, repeated, mentioned = 1, 1 if content_hash else 0, mentions
+        else:
+            recent = repeated = mentioned = 0
+            for index in range(0, user.size * 3, 3):
+                if ring[index] > since:
+                    recent += 1
+                    mentioned += ring[index + 2]
+                    if content_hash and ring[index + 1] == content_hash:
+                        repeated += 1
+        if mentioned >= self.mentions:
+            return MENTIONS
+        if repeated >= self.duplicates:
+            return DUPLICATES
+        if recent >= self.messages:
+            return FLOOD
+        return None
+
+    def _evict(self, users, now, room=0):
+        idle_before = now - self.idle_ms
+        while users:
+            user_id, user = next(iter(users.items()))
+            if user.last_seen >= idle_before and len(users) + room <= self.max_users:
+                break
+            del users[user_id]
+
+    def sweep(self):
+        """Drop idle users everywhere and return how many were dropped."""
+        now = int(self.clock() * 1000)
+        dropped = 0
+        for guild_id, users in list(self._guilds.items()):
+            before = len(users)
+            self._evict(users, now)
+            dropped += before - len(users)
+            if not users:
+                del self._guilds[guild_id]
+        return dropped
+
+    def reset(self, guild_id, user_id):
+        """Forget a user's history, e.g. once they have been dealt with."""
+        users = self._guilds.get(guild_id)
+        if users is not None:
+            users.pop(user_id, None)
+
+    def forget_guild(self, guild_id):
+        self._guilds.pop(guild_id, None)
@@ -0,0 +1,94 @@
+"""
+Gary - SolarVox
+Burst coalescing for outgoing messages
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+"""
+
+import asyncio
+import time
+from collections import deque
+
+
+class _BurstState:
+    __slots__ = ("times", "pending", "task")
+
+    def __init__(self, threshold):
+        self.times = deque(maxlen=max(threshold, 1))
+        self.pending = []
+        self.task = None
+
+
+class BurstCoalescer:
+    """Passes items through one at a time until they arrive in a burst.
+
+    ``flush(key, items)`` is awaited with a list of items for one key (for
+    example a guild id). While fewer than ``threshold`` items arrived for a key
+    in the last ``window`` seconds, each item is flushed on its own right
+    away. After that, items are held for ``delay`` seconds and flushed
+    together in chunks of at most ``max_batch``; a full chunk is flushed
+    without waiting. A threshold of 0 always batches.
+    """
+
+    def __init__(self, flush, threshold=5, window=10.0, delay=5.0, max_batch=50, clock=time.monotonic):
+        self.flush = flush
+        self.threshold = threshold
+        self.window = window
+        self.delay = delay
+        self.max_batch = max_batch
+        self.clock = clock
+        self._states = {}
+        self._tasks = set()
+
+    def _spawn(self, coro):
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def push(self, key, item):
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = _BurstState(self.threshold)
+        now = self.clock()
+        state.times.append(now)
+        bursting = (self.threshold <= 0
+                    or (len(state.times) >= self.threshold and now - state.times[0] <= self.window))
+        if not bursting and not state.pending:
+            self._spawn(self._send(key, [item]))
+            return
+        state.pending.append(item)
+        if len(state.pending) >= self.max_batch:
+            items, state.pending = state.pending, []
+            self._spawn(self._send(key, items))
+        elif state.task is None:
+            state.task = self._spawn(self._drain(key, state))
+
+    async def _send(self, key, items):
+        try:
+            await self.flush(key, items)
+        except Exception as e:
+            print(f" Error flushing batch for {key}: {e}")
+
+    async def _drain(self, key, state):
+        await asyncio.sleep(self.delay)
+        items, state.pending = state.pending, []
+        state.task = None
+        if not state.times or self.clock() - state.times[-1] > self.window:
+            # Quiet again; drop the state so idle guilds cost nothing.
+            self._states.pop(key, None)
+        for start in range(0, len(items), self.max_batch):
+            await self._send(key, items[start:start + self.max_batch])
+
+    async def close(self):
+        """Flush everything still pending right away."""
+        for key, state in list(self._states.items()):
+            if state.task is not None:
+                state.task.cancel()
+                state.task = None
+            items, state.pending = state.pending, []
+            for start in range(0, len(items), self.max_batch):
+                await self._send(key, items[start:start + self.max_batch])
+        self._states.clear()
@@ -0,0 +1,194 @@
+"""
+Gary - SolarVox
+Offline rate-limit check for the bulk scheduler
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+
+Runs bulk.BulkScheduler against a fake API that enforces Discord-style
+buckets: a fixed number of calls per window, a 429 with retry-after once
+the bucket is spent. Windows are scaled down to fractions of a second so
+the whole check takes a few seconds and needs no network.
+
+    python benchmarks/bulk_limits.py
+
+Exits with code 1 if any check fails.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bulk import BulkJob, BulkScheduler  # noqa: E402
+
+LIMIT = 5
+WINDOW = 0.1
+
+
+class FakeRateLimited(Exception):
+    """Looks like discord.HTTPException with status 429 as far as bulk.py cares."""
+
+    status = 429
+
+    def __init__(self, retry_after):
+        super().__init__(f"429 Too Many Requests (retry after {retry_after:.3f}s)")
+        self.retry_after = retry_after
+
+
+class FakeAPI:
+    """One fixed-window bucket per route, the way Discord reports them."""
+
+    def __init__(self, limit=LIMIT, window=WINDOW):
+        self.limit = limit
+        self.window = window
+        self.windows = {}
+        self.paused_until = {}
+        self.calls = []
+        self.rejected = 0
+        self.in_flight = 0
+
+    def pause(self, route, seconds):
+        """Answer the next call on ``route`` with a 429 asking for ``seconds``."""
+        self.paused_until[route] = seconds
+
+    async def call(self, route, key, fail=False):
+        now = time.monotonic()
+        self.calls.append((now, route, key))
+        self.in_flight += 1
+        try:
+            await asyncio.sleep(0.002)  # round trip
+            pause = self.paused_until.pop(route, None)
+            if pause is not None:
+                self.rejected += 1
+                self.windows[route] = [now + pause, 0]
+                raise FakeRateLimited(pause)
+            reset_at, used = self.windows.get(route, (0.0, 0))
+            if now >= reset_at:
+                reset_at, used = now + self.window, 0
+            if used >= self.limit:
+                self.rejected += 1
+                raise FakeRateLimited(reset_at - now)
+            self.windows[route] = [reset_at, used + 1]
+            if fail:
+                raise RuntimeError("Unknown Member")
+        finally:
+            self.in_flight -= 1
+
+
+def jobs_for(api, route, count, failing=()):
+    return [BulkJob(key, route, lambda key=key: api.call(route, key, key in failing)) for key in range(count)]
+
+
+def scheduler():
+    return BulkScheduler(concurrency=4, limit=LIMIT, window=WINDOW)
+
+
+async def check_within_budget():
+    api = FakeAPI()
+    count = 60
+    started = time.monotonic()
+    result = await scheduler().run(jobs_for(api, "ban:1", count))
+    elapsed = time.monotonic() - started
+    problems = []
+    if sorted(result.succeeded) != list(range(count)) or result.failed:
+        problems.append(f"{len(result.succeeded)}/{count} succeeded, failed: {result.failed}")
+    minimum = (count // LIMIT - 1) * WINDOW
+    if elapsed < minimum:
+        problems.append(f"finished in {elapsed:.2f}s, faster than the budget allows ({minimum:.2f}s)")
+    # The scheduler's window starts a moment before Discord's, so a stray 429
+    # right at the boundary is possible; a steady stream of them is not.
+    if api.rejected > count // LIMIT // 4:
+        problems.append(f"{api.rejected} calls were rate limited")
+    return problems
+
+
+async def check_separate_buckets():
+    api = FakeAPI()
+    jobs = jobs_for(api, "ban:1", 20) + jobs_for(api, "ban:2", 20)
+    started = time.monotonic()
+    result = await scheduler().run(jobs)
+    elapsed = time.monotonic() - started
+    problems = []
+    if len(result.succeeded) != 40:
+        problems.append(f"{len(result.succeeded)}/40 succeeded")
+    # Two buckets drain side by side, so this takes about as long as one.
+    if elapsed > (20 // LIMIT + 1) * WINDOW * 1.5:
+        problems.append(f"two independent buckets took {elapsed:.2f}s; they were serialised")
+    return problems
+
+
+async def check_retry_after():
+    api = FakeAPI()
+    api.pause("kick:1", 0.3)
+    result = await scheduler().run(jobs_for(api, "kick:1", 20))
+    problems = []
+    if len(result.succeeded) != 20 or result.failed:
+        problems.append(f"{len(result.succeeded)}/20 succeeded, failed: {result.failed}")
+    if result.rate_limited < 1:
+        problems.append("the 429 was not counted as a rate limit")
+    first = api.calls[0][0]
+    # Calls already in flight when the 429 arrived are fine; new ones are not.
+    early = [at for at, _, _ in api.calls[1:] if at - first < 0.3]
+    if len(early) > 3:
+        problems.append(f"{len(early)} calls were made during the 0.3s retry-after")
+    return problems
+
+
+async def check_failures_not_retried():
+    api = FakeAPI()
+    result = await scheduler().run(jobs_for(api, "ban:1", 10, failing={3, 7}))
+    problems = []
+    if sorted(result.failed) != [3, 7] or len(result.succeeded) != 8:
+        problems.append(f"expected 3 and 7 to fail, got failed={result.failed}")
+    if len(api.calls) != 10:
+        problems.append(f"{len(api.calls)} calls for 10 jobs; plain errors were retried")
+    return problems
+
+
+async def check_progress_error_stops_workers():
+    api = FakeAPI()
+
+    async def on_progress(result):
+        if result.done == 3:
+            raise RuntimeError("progress edit failed")
+
+    problems = []
+    try:
+        await scheduler().run(jobs_for(api, "ban:1", 40), on_progress=on_progress)
+        problems.append("an error from on_progress was swallowed")
+    except RuntimeError:
+        pass
+    calls = len(api.calls)
+    await asyncio.sleep(WINDOW * 3)
+    if len(api.calls) != calls or api.in_flight:
+        problems.append(f"workers kept calling the API after run() raised ({calls} -> {len(api.calls)})")
+    return problems
+
+
+CHECKS = {
+    "within_budget": check_within_budget,
+    "separate_buckets": check_separate_buckets,
+    "retry_after": check_retry_after,
+    "failures_not_retried": check_failures_not_retried,
+    "progress_error": check_progress_error_stops_workers,
+}
+
+
+async def main_async():
+    failed = 0
+    for name, check in CHECKS.items():
+        problems = await check()
+        print(f" {name:<22} {'ok' if not problems else 'FAILED'}")
+        for problem in problems:
+            print(f"   {problem}")
+        failed += bool(problems)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main_async()))
@@ -0,0 +1,70 @@
+"""
+Gary - SolarVox
+Link filter probe corpus
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+
+Checks linkfilter.LinkPolicy against messages that must be caught and
+everyday text that must be left alone, with anti_link on.
+
+    python benchmarks/link_probes.py
+
+Exits with code 1 if any message is handled the wrong way.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from linkfilter import LinkFilter  # noqa: E402
+
+MUST_MATCH = (
+    "check https://example.com/page",
+    "docs at www.python.org",
+    "see evil.com now",
+    "go to example.me/x",
+    "https://thanks.it",
+    "www.logged.in",
+    "bbc.co.uk has it",
+    "join discord.gg/abcdef",
+)
+
+MUST_NOT_MATCH = (
+    # Missing space after a period, not a link
+    "thanks.it works now",
+    "i logged.in fine",
+    "see you.to be fair",
+    "ask.me",
+    "we went.live yesterday",
+    "that was.us all along",
+    # Other dotted text
+    "no links here, just text.",
+    "e.g. this one",
+    "edit main.py and run it",
+    "mail me at someone@example.com",
+    "version 2.5.1",
+)
+
+
+def main():
+    policy = LinkFilter().policy(0, {"anti_link": True})
+    wrong = 0
+    for text in MUST_MATCH:
+        if policy.find_blocked(text) is None:
+            print(f" MISSED   {text!r}")
+            wrong += 1
+    for text in MUST_NOT_MATCH:
+        found = policy.find_blocked(text)
+        if found is not None:
+            print(f" FLAGGED  {text!r} ({found})")
+            wrong += 1
+    print(f" {len(MUST_MATCH) + len(MUST_NOT_MATCH) - wrong}/{len(MUST_MATCH) + len(MUST_NOT_MATCH)} probes ok")
+    return 1 if wrong else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
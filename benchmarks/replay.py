@@ -0,0 +1,421 @@
+"""
+Gary - SolarVox
+Offline event-replay benchmark
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+
+Drives botcore's real handlers with synthetic gateway events. The Discord
+objects are built with discord.py's own models, and the HTTP client is
+replaced by a fake, so nothing connects anywhere.
+
+    python benchmarks/replay.py                    # run and compare to baseline.json
+    python benchmarks/replay.py --update-baseline  # record new baselines
+    python benchmarks/replay.py --scenario links --events 20000
+
+Reports events/sec, p50/p99 handler latency and memory per event (blocks
+still held afterwards, and the tracemalloc peak). Each scenario runs --runs
+times and the median of each figure is kept. The run fails (exit code 1)
+when, compared to the stored baseline, a scenario's events/sec falls or its
+p99, peak bytes or retained blocks per event rise by more than --tolerance.
+Rises smaller than the absolute slack below never fail: a p99 of a few
+microseconds can double on scheduler noise alone.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime, timezone
+from time import perf_counter, perf_counter_ns
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+GUILD_ID = 900000000000000001
+CHANNEL_ID = 900000000000000002
+WELCOME_CHANNEL_ID = 900000000000000003
+LOG_CHANNEL_ID = 900000000000000004
+BOT_ID = 900000000000000010
+USER_BASE = 910000000000000000
+MESSAGE_BASE = 920000000000000000
+NOW = datetime.now(timezone.utc).isoformat()
+
+# Absolute slack on top of --tolerance, per gated figure.
+P99_SLACK_US = 50.0
+PEAK_SLACK_BYTES = 64.0
+RETAINED_SLACK_BLOCKS = 0.5
+
+
+class FakeHTTP:
+    """Stands in for discord.http.HTTPClient and counts calls per method."""
+
+    def __init__(self):
+        self.calls = {}
+        self._next_id = MESSAGE_BASE + 5_000_000
+
+    def _count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    async def send_message(self, channel_id, *, params):
+        self._count("send_message")
+        self._next_id += 1
+        return message_payload(self._next_id, int(channel_id), BOT_ID, "", bot=True)
+
+    async def delete_message(self, channel_id, message_id, *, reason=None):
+        self._count("delete_message")
+
+    async def edit_member(self, guild_id, user_id, *, reason=None, **fields):
+        self._count("edit_member")
+        return dict(member_payload(int(user_id)), **fields)
+
+    def __getattr__(self, name):
+        async def unsupported(*args, **kwargs):
+            self._count(name)
+            raise RuntimeError(f"FakeHTTP.{name} is not implemented")
+        return unsupported
+
+
+def user_payload(user_id, bot=False):
+    return {"id": str(user_id), "username": f"user{user_id % 100000}", "discriminator": "0",
+            "global_name": None, "avatar": None, "bot": bot}
+
+
+def member_payload(user_id, roles=()):
+    return {"user": user_payload(user_id), "roles": [str(role) for role in roles], "joined_at": NOW,
+            "deaf": False, "mute": False, "flags": 0}
+
+
+def message_payload(message_id, channel_id, author_id, content, bot=False):
+    data = {
+        "id": str(message_id), "channel_id": str(channel_id), "guild_id": str(GUILD_ID),
+        "author": user_payload(author_id, bot=bot), "content": content, "timestamp": NOW,
+        "edited_timestamp": None, "tts": False, "mention_everyone": False, "mentions": [],
+        "mention_roles": [], "attachments": [], "embeds": [], "pinned": False, "type": 0,
+    }
+    if not bot:
+        data["member"] = {k: v for k, v in member_payload(author_id).items() if k != "user"}
+    return data
+
+
+def guild_payload():
+    def text_channel(channel_id, name):
+        return {"id": str(channel_id), "type": 0, "name": name, "position": 0,
+                "permission_overwrites": [], "guild_id": str(GUILD_ID)}
+
+    return {
+        "id": str(GUILD_ID), "name": "Benchmark Guild", "owner_id": str(USER_BASE), "member_count": 2,
+        "roles": [{"id": str(GUILD_ID), "name": "@everyone", "permissions": "3072", "position": 0,
+                   "color": 0, "hoist": False, "managed": False, "mentionable": False}],
+        "channels": [text_channel(CHANNEL_ID, "general"), text_channel(WELCOME_CHANNEL_ID, "welcome"),
+                     text_channel(LOG_CHANNEL_ID, "logs")],
+        "members": [member_payload(USER_BASE), dict(member_payload(BOT_ID), user=user_payload(BOT_ID, True))],
+        "emojis": [], "stickers": [], "features": [], "voice_states": [], "presences": [],
+        "threads": [], "stage_instances": [], "guild_scheduled_events": [],
+    }
+
+
+class Harness:
+    def __init__(self, botcore):
+        import discord
+
+        self.discord = discord
+        self.botcore = botcore
+        self.bot = botcore.bot
+        self.http = FakeHTTP()
+        state = self.bot._connection
+        state.http = self.http
+        self.bot.http = self.http
+        state.user = discord.ClientUser(state=state, data=user_payload(BOT_ID, bot=True))
+        self.guild = discord.Guild(data=guild_payload(), state=state)
+        state._add_guild(self.guild)
+        self.channel = self.guild.get_channel(CHANNEL_ID)
+        self.state = state
+        self._message_id = MESSAGE_BASE
+        self.spam_time = 0.0
+
+    async def setup(self):
+        botcore = self.botcore
+        self.bot.loop = asyncio.get_running_loop()
+        await botcore.guild_store.start()
+        await botcore.case_store.start()
+        await botcore.load_cogs()
+        self.logs = self.bot.get_cog("Logs")
+        self.trivia = self.bot.get_cog("Trivia")
+        self.welcome = self.bot.get_cog("Welcome")
+        await botcore.guild_store.ensure_many([GUILD_ID])
+        for key, value in (("welcome_channel", WELCOME_CHANNEL_ID), ("log_channel", LOG_CHANNEL_ID),
+                           ("anti_link", True)):
+            await botcore.guild_store.set(GUILD_ID, key, value)
+        # Long-running loops (storage flushing) are never waited on.
+        self._background = set(asyncio.all_tasks())
+        # Flush background batches straight away so every scenario drains.
+        self.welcome.queue.delay = 0
+        botcore.mod_log._queue.delay = 0
+        self.bot.get_cog("Moderation").spam_tracker.clock = self.spam_clock
+
+    def spam_clock(self):
+        # Replayed messages reach anti-spam two seconds apart, like real chatter
+        # rather than one flood.
+        self.spam_time += 2.0
+        return self.spam_time
+
+    async def teardown(self):
+        for extension in list(self.bot.extensions):
+            await self.bot.unload_extension(extension)
+        await self.botcore.mod_log.close()
+        await self.botcore.guild_store.close()
+        await self.botcore.case_store.close()
+
+    def message(self, content, author_id=USER_BASE + 1, channel_id=CHANNEL_ID):
+        self._message_id += 1
+        channel = self.guild.get_channel(channel_id)
+        return self.discord.Message(state=self.state, channel=channel,
+                                    data=message_payload(self._message_id, channel_id, author_id, content))
+
+    def member(self, user_id):
+        return self.discord.Member(data=member_payload(user_id), guild=self.guild, state=self.state)
+
+    async def drain(self):
+        # Let spawned sends (welcome batches, log flushes) finish.
+        for _ in range(5):
+            await asyncio.sleep(0)
+        pending = [task for task in asyncio.all_tasks()
+                   if task is not asyncio.current_task() and task not in self._background]
+        if pending:
+            await asyncio.wait(pending, timeout=5)
+
+    # Scenarios: each returns a list of (handler, argument) pairs
+    def scenario_chatter(self, count):
+        texts = ("hello there", "how is everyone doing today?", "lol", "gg wp", "anyone up for a game")
+        return [(self.botcore.on_message, self.message(texts[i % len(texts)], USER_BASE + 1 + i % 50))
+                for i in range(count)]
+
+    def scenario_links(self, count):
+        texts = ("check https://example.com/page", "join discord.gg/abcdef", "see evil.com now",
+                 "no links here, just text.", "docs at www.python.org", "thanks.it works now")
+        return [(self.botcore.on_message, self.message(texts[i % len(texts)], USER_BASE + 1 + i % 50))
+                for i in range(count)]
+
+    def scenario_trivia(self, count):
+        bank = self.trivia.bank
+        events = []
+        for i in range(count):
+            answer = bank.get(i % len(bank))[1]
+            reply = answer if i % 2 == 0 else "wrong answer"
+            events.append((self._answer, (answer, self.message(reply))))
+        return events
+
+    async def _answer(self, pair):
+        answer, message = pair
+        self.trivia.sessions.start(CHANNEL_ID, answer)
+        await self.botcore.on_message(message)
+
+    def scenario_commands(self, count):
+        texts = ("C!ping", "C!8ball will-it-work", "C!unknowncommand")
+        return [(self.botcore.on_message, self.message(texts[i % len(texts)])) for i in range(count)]
+
+    def scenario_spam(self, count):
+        # One user repeating themselves; every third message trips anti-spam.
+        return [(self.botcore.on_message, self.message("FREE NITRO at this totally real site"))
+                for _ in range(count)]
+
+    def scenario_moderation(self, count):
+        # Prefix moderation commands through the shared command executor.
+        texts = (f"C!timeout {USER_BASE} 10m spamming", f"C!untimeout {USER_BASE}")
+        return [(self.botcore.on_message, self.message(texts[i % len(texts)])) for i in range(count)]
+
+    def scenario_join_raid(self, count):
+        return [(self.welcome.on_member_join, self.member(USER_BASE + 100000 + i)) for i in range(count)]
+
+    def scenario_purge(self, count):
+        # Messages arrive (and are snapshotted), then get deleted one by one
+        # or purged in batches of 100; one in five edits comes before the delete.
+        events = []
+        i = 0
+        while len(events) < count:
+            i += 1
+            if i % 10 == 0:
+                messages = [self.message(f"spam {n}") for n in range(100)]
+                events.extend((self._arrive, message) for message in messages)
+                payload = self.discord.RawBulkMessageDeleteEvent(
+                    {"ids": [str(message.id) for message in messages], "channel_id": str(CHANNEL_ID),
+                     "guild_id": str(GUILD_ID)})
+                events.append((self.logs.on_raw_bulk_message_delete, payload))
+                continue
+            message = self.message(f"message {i}")
+            events.append((self._arrive, message))
+            if i % 5 == 1:
+                events.append((self.logs.on_raw_message_edit, self.raw_edit(
+                    message_payload(message.id, CHANNEL_ID, message.author.id, f"edited message {i}"))))
+            events.append((self.logs.on_raw_message_delete, self.discord.RawMessageDeleteEvent(
+                {"id": str(message.id), "channel_id": str(CHANNEL_ID), "guild_id": str(GUILD_ID)})))
+        return events[:count]
+
+    def raw_edit(self, data):
+        data = dict(data, guild_id=str(GUILD_ID))
+        try:
+            message = self.discord.Message(state=self.state, channel=self.channel, data=data)
+            return self.discord.RawMessageUpdateEvent(data=data, message=message)
+        except TypeError:  # discord.py < 2.5 builds it from the dict alone
+            return self.discord.RawMessageUpdateEvent(data)
+
+    async def _arrive(self, message):
+        await self.logs.snapshot_stage(message)
+
+
+SCENARIOS = ("chatter", "links", "trivia", "commands", "moderation", "spam", "join_raid", "purge")
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return sorted_values[index]
+
+
+async def run_scenario(harness, name, count):
+    events = getattr(harness, f"scenario_{name}")(count)
+    # Warm caches (settings, compiled policies, metric children) first.
+    for handler, arg in events[:min(50, len(events))]:
+        await handler(arg)
+    await harness.drain()
+
+    latencies = []
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    start = perf_counter()
+    for handler, arg in events:
+        began = perf_counter_ns()
+        await handler(arg)
+        latencies.append(perf_counter_ns() - began)
+    await harness.drain()
+    elapsed = perf_counter() - start
+    blocks_after = sys.getallocatedblocks()
+
+    # Second, smaller pass under tracemalloc for the memory peak per event.
+    sample = events[:min(500, len(events))]
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    for handler, arg in sample:
+        await handler(arg)
+    await harness.drain()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "events": len(events),
+        "events_per_sec": round(len(events) / elapsed, 1),
+        "p50_us": round(percentile(latencies, 0.50) / 1000, 1),
+        "p99_us": round(percentile(latencies, 0.99) / 1000, 1),
+        "retained_blocks_per_event": round((blocks_after - blocks_before - len(latencies)) / len(events), 2),
+        "peak_bytes_per_event": round(max(0, peak - base) / len(sample), 1),
+    }
+
+
+def compare(results, baseline, tolerance):
+    failures = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if not expected:
+            continue
+        if result["events_per_sec"] < expected["events_per_sec"] * (1 - tolerance):
+            failures.append(f"{name}: {result['events_per_sec']} events/sec, baseline {expected['events_per_sec']}")
+        for key, unit, slack in (("p99_us", "us", P99_SLACK_US),
+                                 ("peak_bytes_per_event", " B/event", PEAK_SLACK_BYTES),
+                                 ("retained_blocks_per_event", " blocks/event", RETAINED_SLACK_BLOCKS)):
+            if key in expected and result[key] > max(expected[key], 0) * (1 + tolerance) + slack:
+                failures.append(f"{name}: {key} {result[key]}{unit}, baseline {expected[key]}{unit}")
+    return failures
+
+
+def median_result(runs):
+    """Median of each figure across repeated runs of one scenario."""
+    return {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+
+
+def load_botcore(workdir):
+    """Import botcore with config.json and storage pointed at a scratch directory."""
+    with open(os.path.join(ROOT, "config.json")) as file:
+        config = json.load(file)
+    config["storage"] = {"backend": "sqlite", "sqlite_path": os.path.join(workdir, "bench.db")}
+    config["metrics"] = {"enabled": False}
+    config["cases"] = {"sqlite_path": os.path.join(workdir, "cases.db")}
+    trivia = config.setdefault("trivia", {})
+    trivia["bank"] = os.path.join(ROOT, trivia.get("bank", "trivia_questions.jsonl"))
+    with open(os.path.join(workdir, "config.json"), "w") as file:
+        json.dump(config, file)
+    os.chdir(workdir)
+    sys.path.insert(0, ROOT)
+    import botcore
+
+    return botcore
+
+
+async def main_async(args, botcore):
+    harness = Harness(botcore)
+    await harness.setup()
+    results = {}
+    try:
+        for name in args.scenario or SCENARIOS:
+            results[name] = median_result([await run_scenario(harness, name, args.events)
+                                           for _ in range(max(1, args.runs))])
+            row = results[name]
+            print(f" {name:<10} {row['events_per_sec']:>10.1f} ev/s  p50 {row['p50_us']:>8.1f}us  "
+                  f"p99 {row['p99_us']:>8.1f}us  retained {row['retained_blocks_per_event']:>6.2f} blk/ev  "
+                  f"peak {row['peak_bytes_per_event']:>8.1f} B/ev")
+    finally:
+        await harness.teardown()
+    print(f" HTTP calls: {harness.http.calls}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay synthetic gateway events through botcore's handlers.")
+    parser.add_argument("--events", type=int, default=5000, help="events per scenario")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="run only this scenario (repeatable)")
+    parser.add_argument("--runs", type=int, default=3, help="runs per scenario; the median is reported")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed regression versus baseline (0.5 = 50%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="solarvox-bench-")
+    try:
+        botcore = load_botcore(workdir)
+        results = asyncio.run(main_async(args, botcore))
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(BASELINE_FILE):
+            with open(BASELINE_FILE) as file:
+                baseline = json.load(file)
+        baseline.update(results)
+        with open(BASELINE_FILE, "w") as file:
+            json.dump(baseline, file, indent=4, sort_keys=True)
+        print(f" Baseline written to {BASELINE_FILE}")
+        return 0
+
+    if not os.path.exists(BASELINE_FILE):
+        print(" No baseline yet; run with --update-baseline to record one.")
+        return 0
+    with open(BASELINE_FILE) as file:
+        failures = compare(results, json.load(file), args.tolerance)
+    for failure in failures:
+        print(f" REGRESSION {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
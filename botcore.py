@@ -13,74 +13,320 @@ from discord import Embed
 from discord.ext import commands, tasks
 from discord import app_commands
 from discord.ui import Button, View
+import re
 import json
-import random
+import hashlib
+import os
+import sys
+from time import perf_counter
 import logging
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 import asyncio
 
-# -------------------------------
-# Optional MariaDB / MySQL setup
-# -------------------------------
-# import mysql.connector
-# db = mysql.connector.connect(
-#     host="localhost",
-#     user="root",
-#     password="password",
-#     database="solarvox_db"
-# )
-# cursor = db.cursor()
-# Use this for storing persistent data instead of JSON if desired.
+from config_store import ConfigStore
+from storage import GuildStore, create_backend
+from pipeline import MessagePipeline
+from linkfilter import LinkFilter
+from resolved import ResolvedCache
+from metrics import BotMetrics, serve as serve_metrics
+from loopwatch import LoopWatchdog
+from welcome import pack_lines
+from modlog import LogSink
+from cases import CaseStore
+from expiry import ExpiryScheduler
+from snapshots import SnapshotCache
+from responder import execute
+
+# The cogs import their shared state from botcore; when this file is run
+# directly, make that import return this module instead of a second copy.
+sys.modules.setdefault("botcore", sys.modules[__name__])
 
 footer = "COPYRIGHT"
 footer_text = "© SolarVox 2025" if footer == "COPYRIGHT" else footer
 
 CONFIG_FILE = "config.json"
 
-def load_config():
-    try:
-        with open(CONFIG_FILE, "r") as file:
-            return json.load(file)
-    except FileNotFoundError:
-        return {}
-
-config = load_config()
+# Config lives in memory; changes are written back in the background.
+config_store = ConfigStore(CONFIG_FILE)
+config = config_store.data
 
 def save_config():
-    with open(CONFIG_FILE, "w") as file:
-        json.dump(config, file, indent=4)
+    config_store.mark_dirty()
+
+# -------------------------------
+# Per-server storage
+# -------------------------------
+# SQLite by default. Set "storage": {"backend": "mysql", "mysql": {...}} in
+# config.json to use MariaDB / MySQL instead. "cache_size" caps the settings
+# cache; by default it grows to fit the guilds this process serves.
+DEFAULT_GUILD_CONFIG = {
+    "prefix": "C!",
+    "welcome_channel": 0,
+    "log_channel": 0,
+    "ticket_category": 0,
+    "admin_role": 0,
+    "anti_link": True,
+    "anti_spam": True,
+    "welcome_message": "Welcome to {guild.name}, {user}!",
+    "leave_message": "Goodbye, {user}!"
+}
+
+# Top-level keys in config.json act as the defaults for new servers.
+guild_defaults = {key: config.get(key, value) for key, value in DEFAULT_GUILD_CONFIG.items()}
+guild_store = GuildStore(create_backend(config.get("storage")), guild_defaults,
+                         cache_size=(config.get("storage") or {}).get("cache_size"))
+
+# Link rules are compiled per server and rebuilt when its settings change.
+link_filter = LinkFilter()
+guild_store.add_listener(lambda guild_id, key: link_filter.invalidate(guild_id))
+
+# Muted role and configured channels, resolved once per server
+resolved = ResolvedCache()
 
 # Add default server config
 async def add_server_config(guild):
-    if str(guild.id) not in config:
-        config[str(guild.id)] = {
-            "prefix": "C!",
-            "welcome_channel": 0,
-            "log_channel": 0,
-            "ticket_category": 0,
-            "admin_role": 0,
-            "anti_link": True,
-            "welcome_message": "Welcome to {guild.name}, {user}!",
-            "leave_message": "Goodbye, {user}!"
-        }
-        save_config()
+    guild_store.fit_to(len(bot.guilds))
+    if await guild_store.ensure_many([guild.id]):
         print(f" Added default config for server: {guild.name} ({guild.id})")
 
 # Bot setup
-intents = discord.Intents.all()
-intents.message_content = True 
-bot = commands.Bot(command_prefix=config.get("prefix", "C!"), intents=intents)
+# -------------------------------
+# Cluster mode (see cluster.py)
+# -------------------------------
+# cluster.py sets these for each worker process; without them the bot runs
+# as a single process exactly as before.
+CLUSTER_ID = int(os.environ["SOLARVOX_CLUSTER_ID"]) if "SOLARVOX_CLUSTER_ID" in os.environ else None
+SHARD_IDS = [int(shard) for shard in os.environ.get("SOLARVOX_SHARD_IDS", "").split(",") if shard]
+SHARD_COUNT = int(os.environ.get("SOLARVOX_SHARD_COUNT", 0)) or None
+cluster_link = None  # cluster.WorkerLink, set by the worker before main()
+
+BotBase = commands.AutoShardedBot if SHARD_IDS else commands.Bot
+
+def owns_guild(guild_id):
+    # Discord routes a guild to shard (guild_id >> 22) % shard_count.
+    return not SHARD_IDS or (guild_id >> 22) % SHARD_COUNT in SHARD_IDS
+
+def request_shutdown():
+    # The supervisor asks over the pipe (or with SIGTERM); closing the bot
+    # flushes queued settings and cases before the process exits.
+    if not bot.is_closed():
+        asyncio.ensure_future(bot.close())
+
+# -------------------------------
+# Metrics
+# -------------------------------
+# Command/event latency histograms and REST call counts, served as Prometheus
+# text on a local port and summarised by /stats.
+metrics_settings = config.get("metrics", {})
+bot_metrics = BotMetrics()
+
+# Loop lag is measured all the time; stalls past the threshold are logged
+# with the stack of whatever was blocking (see /stalls).
+watchdog_settings = config.get("watchdog", {})
+loop_watchdog = LoopWatchdog(
+    threshold=watchdog_settings.get("threshold", 0.25),
+    interval=watchdog_settings.get("interval", 0.1),
+    observe=bot_metrics.registry.histogram("solarvox_loop_lag_seconds", "Event loop lag.", "loop").child("main").observe)
+
+class SolarVoxTree(app_commands.CommandTree):
+    async def interaction_check(self, interaction):
+        interaction.extras["metrics_start"] = perf_counter()
+        return True
+
+    async def on_error(self, interaction, error):
+        if interaction.command is not None:
+            name = "/" + interaction.command.qualified_name
+            bot_metrics.command_errors.child(name).value += 1
+            if "metrics_start" in interaction.extras:
+                bot_metrics.command_latency.child(name).observe(perf_counter() - interaction.extras["metrics_start"])
+        await super().on_error(interaction, error)
+
+class SolarVoxBot(BotBase):
+    async def setup_hook(self):
+        if watchdog_settings.get("enabled", True):
+            loop_watchdog.start(asyncio.get_running_loop())
+        config_store.start()
+        await guild_store.start()
+        await case_store.start()
+        pending = await expiry_scheduler.start()
+        if pending:
+            print(f" Loaded {pending} pending temporary bans/mutes.")
+        await load_cogs()
+        global help_view
+        build_help_pages()
+        help_view = HelpPaginator()
+        self.add_view(help_view)
+        if cluster_link is not None:
+            cluster_link.start(asyncio.get_running_loop(), request_shutdown)
+            report_cluster_stats.start()
+        elif await guild_store.migrate_from_config(config):
+            # Only single-process runs migrate; cluster workers share the store.
+            save_config()
+            print(" Migrated server configs from config.json to storage.")
+        if metrics_settings.get("enabled", True):
+            host, port = metrics_settings.get("host", "127.0.0.1"), metrics_settings.get("port", 9108)
+            if CLUSTER_ID:
+                port += CLUSTER_ID
+            try:
+                await serve_metrics(bot_metrics.registry, host, port)
+                print(f" Metrics available at http://{host}:{port}/metrics")
+            except OSError as e:
+                print(f" Could not start metrics endpoint: {e}")
+        if CLUSTER_ID:
+            # Only cluster 0 syncs slash commands and writes config.json.
+            return
+        # Runs once per process, after login and before connecting, so
+        # gateway reconnects never re-sync.
+        try:
+            synced = await sync_command_tree()
+            if synced is None:
+                print(" Slash commands unchanged, skipping sync.")
+            else:
+                print(f" Synced {len(synced)} slash commands.")
+        except Exception as e:
+            print(f" Error syncing commands: {e}")
+
+    async def close(self):
+        loop_watchdog.stop()
+        # Unload the cogs first so they can flush (welcome batches) while
+        # storage is still open.
+        for extension in list(self.extensions):
+            try:
+                await self.unload_extension(extension)
+            except Exception as e:
+                print(f" Error unloading {extension}: {e}")
+        # Each store closes on its own, so one failed flush doesn't lose the rest.
+        # The expiry scheduler shares the case store's connection and goes first.
+        for name, store in (("mod log", mod_log), ("config", config_store), ("guild settings", guild_store),
+                            ("expiries", expiry_scheduler), ("cases", case_store)):
+            try:
+                await store.close()
+            except Exception as e:
+                print(f" Error closing {name}: {e}")
+        await super().close()
+
+# Slash command sync
+# The tree is fingerprinted and only synced when the fingerprint changes.
+def command_tree_fingerprint():
+    payload = []
+    for command in bot.tree.get_commands():
+        try:
+            payload.append(command.to_dict(bot.tree))
+        except TypeError:  # discord.py < 2.4
+            payload.append(command.to_dict())
+    payload.sort(key=lambda data: (data.get("type", 1), data["name"]))
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+async def sync_command_tree(force=False):
+    fingerprint = f"{bot.application_id}:{command_tree_fingerprint()}"
+    if not force and config.get("_command_tree_hash") == fingerprint:
+        return None
+    synced = await bot.tree.sync()
+    config["_command_tree_hash"] = fingerprint
+    save_config()
+    return synced
+
+async def get_prefix(bot, message):
+    if message.guild is None:
+        return config.get("prefix", "C!")
+    return await guild_store.get_value(message.guild.id, "prefix", config.get("prefix", "C!"))
+
+# Gateway mode
+# "full" caches every member and presence and chunks all guilds at startup.
+# "lean" asks only for the intents the bot's features use, caches no other
+# members and fetches them when a command needs one.
+gateway_settings = config.get("gateway", {})
+LEAN_GATEWAY = gateway_settings.get("mode", "full") == "lean"
+
+def gateway_options():
+    if not LEAN_GATEWAY:
+        intents = discord.Intents.all()
+        intents.message_content = True
+        return dict(intents=intents)
+    intents = discord.Intents.none()
+    intents.guilds = True               # guilds, channels, roles
+    intents.guild_messages = True       # message pipeline, delete logging
+    intents.dm_messages = True          # prefix commands in DMs
+    intents.message_content = True      # prefix commands, anti-link, anti-spam, trivia
+    intents.members = gateway_settings.get("member_events", True)  # welcome/leave, /mass joined_within
+    return dict(intents=intents, member_cache_flags=discord.MemberCacheFlags.none(),
+                chunk_guilds_at_startup=False)
+
+if SHARD_IDS:
+    bot = SolarVoxBot(command_prefix=get_prefix, tree_cls=SolarVoxTree, http_trace=bot_metrics.http_trace(),
+                      shard_ids=SHARD_IDS, shard_count=SHARD_COUNT, max_messages=None, **gateway_options())
+else:
+    bot = SolarVoxBot(command_prefix=get_prefix, tree_cls=SolarVoxTree, http_trace=bot_metrics.http_trace(),
+                      max_messages=None, **gateway_options())
+
+async def resolve_member(guild, user_id):
+    """A guild member from the cache, or fetched when the cache doesn't hold them."""
+    return guild.get_member(user_id) or await guild.fetch_member(user_id)
+
+# Prefix command timing
+@bot.before_invoke
+async def start_command_timer(ctx):
+    ctx.metrics_start = perf_counter()
+
+@bot.after_invoke
+async def record_command_timer(ctx):
+    name = ctx.command.qualified_name
+    bot_metrics.command_latency.child(name).observe(perf_counter() - ctx.metrics_start)
+    if ctx.command_failed:
+        bot_metrics.command_errors.child(name).value += 1
+
+@bot.event
+async def on_app_command_completion(interaction, command):
+    start = interaction.extras.get("metrics_start")
+    if start is not None:
+        bot_metrics.command_latency.child("/" + command.qualified_name).observe(perf_counter() - start)
 
 def parse_time(duration: str) -> timedelta:
-    units = {"s": "seconds", "m": "minutes", "h": "hours"}
+    units = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
     unit = duration[-1]
     amount = int(duration[:-1])
     return timedelta(**{units[unit]: amount})
 
 @bot.event
+@bot_metrics.instrument("on_guild_join")
 async def on_guild_join(guild):
     await add_server_config(guild)
 
+@bot.event
+async def on_guild_remove(guild):
+    resolved.forget_guild(guild.id)
+    for channel in guild.channels:
+        message_snapshots.forget_channel(channel.id)
+
+# Keep the resolved role/channel cache in step with the server
+@bot.event
+async def on_guild_role_create(role):
+    resolved.invalidate_role(role)
+
+@bot.event
+async def on_guild_role_update(before, after):
+    resolved.invalidate_role(before)
+    resolved.invalidate_role(after)
+
+@bot.event
+async def on_guild_role_delete(role):
+    resolved.invalidate_role(role)
+
+@bot.event
+async def on_guild_channel_create(channel):
+    resolved.invalidate_channel(channel)
+
+@bot.event
+async def on_guild_channel_update(before, after):
+    resolved.invalidate_channel(after)
+
+@bot.event
+async def on_guild_channel_delete(channel):
+    resolved.invalidate_channel(channel)
+    message_snapshots.forget_channel(channel.id)
+
+
+bootstrapped = False
 
 statuses = [
     "/trivia test ur brain! ",
@@ -93,183 +339,214 @@ statuses = [
 
 @bot.event
 async def on_ready():
+    # on_ready fires again after every full reconnect; only bootstrap once.
+    global bootstrapped
     print(f" Gary is online as {bot.user}!")
-    for guild in bot.guilds:
-        await add_server_config(guild)
-    try:
-        synced = await bot.tree.sync()
-        print(f" Synced {len(synced)} slash commands.")
-    except Exception as e:
-        print(f" Error syncing commands: {e}")
-    rotate_status.start()
+    guild_store.fit_to(len(bot.guilds))
+    if not bootstrapped:
+        bootstrapped = True
+        added = await guild_store.ensure_many([guild.id for guild in bot.guilds])
+        if added:
+            print(f" Added default config for {len(added)} servers.")
+    if not rotate_status.is_running():
+        rotate_status.start()
 
 @tasks.loop(seconds=20)
 async def rotate_status():
     for status in statuses:
-        guild_count = len(bot.guilds)
+        guild_count = cluster_totals()["guilds"]
         activity = discord.CustomActivity(name=status.format(guild_count=guild_count))
         await bot.change_presence(status=discord.Status.dnd, activity=activity)
         await asyncio.sleep(20)  
 
+# Gateway events seen by this process, for the cluster event rate
+gateway_events = 0
 
-
-# Welcome and Leave Messages
 @bot.event
-async def on_member_join(member):
-    channel = bot.get_channel(config["welcome_channel"])
-    if channel:
-        welcome_message = config["welcome_message"].replace("{user}", member.mention)
-        await channel.send(embed=discord.Embed(
-            title="Welcome!",
-            description=welcome_message,
-            color=0x00FF00).set_footer(text=footer_text))
+async def on_socket_event_type(event_type):
+    global gateway_events
+    gateway_events += 1
+
+def local_stats():
+    return {
+        "shards": sorted(bot.shards) if SHARD_IDS else [0],
+        "guilds": len(bot.guilds),
+        "latency": bot.latency,
+        "events_per_sec": 0.0,
+    }
+
+def cluster_totals():
+    if cluster_link is not None and cluster_link.totals:
+        return cluster_link.totals
+    stats = local_stats()
+    return dict(stats, workers=1, shards=len(stats["shards"]), max_latency=stats["latency"], per_worker={0: stats})
+
+@tasks.loop(seconds=5)
+async def report_cluster_stats():
+    global gateway_events
+    stats = local_stats()
+    stats["events_per_sec"] = gateway_events / 5
+    gateway_events = 0
+    cluster_link.send_stats(stats)
+
+@bot.tree.command(name="cluster", description="Show guild, shard and latency totals across the cluster.")
+async def cluster_cmd(interaction: discord.Interaction):
+    totals = cluster_totals()
+    embed = discord.Embed(
+        title="🛰️ Cluster Stats",
+        description=f"Workers: **{totals['workers']}**\nShards: **{totals['shards']}**\nGuilds: **{totals['guilds']}**",
+        color=0x3498DB)
+    for cluster_id, stats in totals["per_worker"].items():
+        latency = stats.get("latency")
+        latency = f"{round(latency * 1000)}ms" if latency is not None and latency == latency else "n/a"
+        embed.add_field(
+            name=f"Cluster {cluster_id}",
+            value=f"Shards {stats['shards']}\n{stats['guilds']} guilds\n{latency}, {stats['events_per_sec']:.1f} ev/s")
+    await interaction.response.send_message(embed=embed.set_footer(text=footer_text))
+
+# Force a slash command sync (owner only)
+@bot.command(name="sync", hidden=True)
+@commands.is_owner()
+async def sync_prefix(ctx):
+    synced = await sync_command_tree(force=True)
+    await ctx.send(f"✅ Synced {len(synced)} slash commands.")
+
+# -------------------------------
+# Cogs
+# -------------------------------
+# Features live in cogs/ and are loaded in setup_hook. List any of them in
+# "cogs": {"disabled": [...]} to leave them out of a deployment. C!reload
+# swaps one in place while the gateway session, storage and caches stay up.
+COGS = ("moderation", "fun", "trivia", "logs", "welcome")
+cog_settings = config.get("cogs", {})
+
+async def load_cogs():
+    disabled = set(cog_settings.get("disabled", []))
+    for name in COGS:
+        if name in disabled:
+            continue
+        try:
+            await bot.load_extension(f"cogs.{name}")
+        except commands.ExtensionError as e:
+            print(f" Could not load cog {name}: {e}")
+
+@bot.command(name="reload", hidden=True)
+@commands.is_owner()
+async def reload_prefix(ctx, name: str):
+    name = name.lower()
+    if name not in COGS:
+        await ctx.send(f"⚠️ Unknown cog. Choose from: {', '.join(COGS)}")
+        return
+    extension = f"cogs.{name}"
+    try:
+        if extension in bot.extensions:
+            await bot.reload_extension(extension)
+        else:
+            await bot.load_extension(extension)
+    except commands.ExtensionError as e:
+        # A failed reload leaves the previous version running.
+        await ctx.send(f"⚠️ Could not load {name}: {e}")
+        return
+    build_help_pages()
+    note = ""
+    if not CLUSTER_ID:
+        synced = await sync_command_tree()
+        if synced is not None:
+            note = f" Synced {len(synced)} slash commands."
+    await ctx.send(f"✅ Reloaded {name}.{note}")
+
 
-@bot.event
-async def on_member_remove(member):
-    channel = bot.get_channel(config["welcome_channel"])
-    if channel:
-        leave_message = config["leave_message"].replace("{user}", member.name)
-        await channel.send(embed=discord.Embed(
-            title="Farewell!",
-            description=leave_message,
-            color=0xFF0000).set_footer(text=footer_text))
 
 # Logging Events
-@bot.event
-async def on_message_delete(message):
-    channel = bot.get_channel(config["log_channel"])
-    if channel:
-        embed = discord.Embed(title="🗑️ Message Deleted", description=f"**Content:** {message.content}", color=0xFF4500)
-        embed.set_author(name=message.author.name, icon_url=message.author.display_avatar.url)
-        embed.set_footer(text=f"{footer_text} | Channel: {message.channel.name}")
-        await channel.send(embed=embed)
-
-# Moderation Commands (Prefix & Slash)
-async def ban_member(interaction, member, reason):
-    await member.ban(reason=reason)
-    await interaction.response.send_message(embed=discord.Embed(
-        title="🔨 User Banned",
-        description=f"Banned {member.mention} for: {reason}",
-        color=0xFF0000).set_footer(text=footer_text)) 
-
-@bot.tree.command(name="ban", description="Ban a user from the server.")
-async def ban(interaction: discord.Interaction, member: discord.Member, reason: str = "No reason provided"):
-    await ban_member(interaction, member, reason)
-
-@bot.command(name="ban")
-async def ban_prefix(ctx, member: discord.Member, *, reason="No reason provided"):
-    await ban_member(ctx, member, reason)
-
-async def kick_member(interaction, member, reason):
-    await member.kick(reason=reason)
-    await interaction.response.send_message(embed=discord.Embed(
-        title="👢 User Kicked",
-        description=f"Kicked {member.mention} for: {reason}",
-        color=0xFFAA00).set_footer(text=footer_text))
-
-@bot.tree.command(name="kick", description="Kick a user from the server.")
-async def kick(interaction: discord.Interaction, member: discord.Member, reason: str = "No reason provided"):
-    await kick_member(interaction, member, reason)
-
-@bot.command(name="kick")
-async def kick_prefix(ctx, member: discord.Member, *, reason="No reason provided"):
-    await kick_member(ctx, member, reason)
-
-# Unban Command
-async def unban_member(interaction, user_id, reason):
-    user = await bot.fetch_user(user_id)
-    await bot.unban(user)
-    await interaction.response.send_message(embed=discord.Embed(
-        title="🔓 User Unbanned",
-        description=f"Unbanned {user.mention} for: {reason}",
-        color=0x00FF00).set_footer(text=footer_text))
-
-@bot.tree.command(name="unban", description="Unban a user from the server.")
-async def unban(interaction: discord.Interaction, user_id: int, reason: str = "No reason provided"):
-    await unban_member(interaction, user_id, reason)
-
-@bot.command(name="unban")
-async def unban_prefix(ctx, user_id: int, *, reason="No reason provided"):
-    await unban_member(ctx, user_id, reason)
-
-# Mute Command (Prefix & Slash)
-async def mute_member(interaction, member, reason):
-    role = discord.utils.get(member.guild.roles, name="Muted")
-    if not role:
-        role = await member.guild.create_role(name="Muted", permissions=discord.Permissions(send_messages=False))
-    await member.add_roles(role)
-    await interaction.response.send_message(embed=discord.Embed(
-        title="🔇 User Muted",
-        description=f"Muted {member.mention} for: {reason}",
-        color=0xFF0000).set_footer(text=footer_text))
-
-@bot.tree.command(name="mute", description="Mute a user.")
-async def mute(interaction: discord.Interaction, member: discord.Member, reason: str = "No reason provided"):
-    await mute_member(interaction, member, reason)
-
-@bot.command(name="mute")
-async def mute_prefix(ctx, member: discord.Member, *, reason="No reason provided"):
-    await mute_member(ctx, member, reason)
-
-# Unmute Command (Prefix & Slash)
-async def unmute_member(interaction, member):
-    role = discord.utils.get(member.guild.roles, name="Muted")
-    if role:
-        await member.remove_roles(role)
-    await interaction.response.send_message(embed=discord.Embed(
-        title="🔊 User Unmuted",
-        description=f"Unmuted {member.mention}",
-        color=0x00FF00).set_footer(text=footer_text))
-
-@bot.tree.command(name="unmute", description="Unmute a user.")
-async def unmute(interaction: discord.Interaction, member: discord.Member):
-    await unmute_member(interaction, member)
-
-@bot.command(name="unmute")
-async def unmute_prefix(ctx, member: discord.Member):
-    await unmute_member(ctx, member)
-
-@bot.tree.command(name="ping", description="Check the bot's latency.")
-async def ping(interaction: discord.Interaction):
-    latency = round(bot.latency * 1000)
-    await interaction.response.send_message(f"🏓 Pong! Latency: '''{latency}ms'''")
-
-@bot.command(name="ping")
-async def ping_prefix(ctx):
-    latency = round(bot.latency * 1000)
-    await ctx.send(f"🏓 Pong! Latency: '''{latency}ms'''")
-
-@bot.tree.command(name="8ball", description="Ask the magic 8-ball a question.")
-async def eight_ball(interaction: discord.Interaction, question: str):
-    responses = ["Yes", "No", "Maybe", "Definitely", "I don't know"]
-    await interaction.response.send_message(embed=discord.Embed(
-        title="🎱 Magic 8-Ball",
-        description=f"Question: {question}\nAnswer: {random.choice(responses)}",
-        color=0x2ECC71).set_footer(text=footer_text))
-
-@bot.command(name="8ball")
-async def eightball_prefix(ctx, question: str):
-    responses = ["Yes", "No", "Maybe", "Definitely", "I don't know"]
-    await ctx.send(f"🎱 Magic 8-Ball says: {random.choice(responses)}")
-
-# Image Manipulation Command (PFP Steal)
-@bot.tree.command(name="pfp_steal", description="Steal someone's profile picture.")
-async def pfp_steal(interaction: discord.Interaction, member: discord.Member):
-    await interaction.response.send_message(embed=discord.Embed(
-        title=f"🖼️ {member.name}'s Profile Picture",
-        description=f"Here's {member.name}'s profile picture:",
-        color=0xFF69B4).set_image(url=member.display_avatar.url).set_footer(text=footer_text))
-
-@bot.command(name="pfp_steal")
-async def pfp_steal_prefix(ctx, member: discord.Member):
-    await ctx.send(f"🖼️ {member.name}'s Profile Picture: {member.display_avatar.url}")
+# Everything sent to a server's log channel goes through one buffered sink.
+async def resolve_log_channel(guild_id):
+    guild = bot.get_guild(guild_id)
+    if guild is None:
+        return None
+    return resolved.channel(guild, await guild_store.get_value(guild_id, "log_channel"))
+
+mod_log = LogSink(resolve_log_channel, interval=2.0)
+
+# Every moderation action is also kept as a numbered case (see /history).
+case_settings = config.get("cases", {})
+case_store = CaseStore(case_settings.get("sqlite_path", "solarvox_cases.db"))
+
+def record_case(guild, user_id, moderator, action, reason=None, duration=None):
+    case_store.add(guild.id, user_id, moderator.id, action, reason, duration)
+
+def log_action(guild, moderator, title, description, color):
+    embed = discord.Embed(title=title, description=description, color=color, timestamp=discord.utils.utcnow())
+    embed.set_footer(text=f"{footer_text} | Moderator: {moderator}")
+    mod_log.log(guild.id, embed)
+
+# Deleted and edited messages are logged (cogs/logs.py) from our own
+# snapshots rather than discord.py's message cache (turned off with
+# max_messages=None): a few hundred bytes per message instead of a full
+# Message, bounded per channel and in total. The cache lives here so it
+# survives reloading the cog.
+snapshot_settings = config.get("message_log", {})
+message_snapshots = SnapshotCache(
+    per_channel=snapshot_settings.get("per_channel", 500),
+    budget=int(snapshot_settings.get("budget_mb", 16) * 2**20),
+    max_content=snapshot_settings.get("max_content", 1000))
+
+# Temporary bans and mutes
+# One scheduler task sleeps until the next expiry; deadlines are stored next
+# to the cases so they survive restarts.
+MAX_TIMEOUT = timedelta(days=28)
+DURATION_RE = re.compile(r"^\d+[smhdw]$")
+
+def split_duration(text):
+    """``"7d being rude"`` -> ``("7d", "being rude")`` for prefix commands."""
+    first, _, rest = text.partition(" ")
+    if DURATION_RE.match(first):
+        return first, rest.strip() or "No reason provided"
+    return None, text
+
+def valid_duration(duration):
+    try:
+        parse_time(duration)
+    except (KeyError, ValueError):
+        return False
+    return True
+
+async def run_expiry(guild_id, user_id, action):
+    await bot.wait_until_ready()
+    guild = bot.get_guild(guild_id)
+    if guild is None:
+        return  # The bot has left this server
+    if action == "unban":
+        try:
+            await guild.unban(discord.Object(id=user_id), reason="Temporary ban expired")
+        except discord.NotFound:
+            return
+        title, color = "🔓 Temporary Ban Expired", 0x00FF00
+    else:
+        try:
+            member = await resolve_member(guild, user_id)
+        except discord.NotFound:
+            return
+        role = resolved.muted_role(guild)
+        if role is None or role not in member.roles:
+            return
+        await member.remove_roles(role, reason="Temporary mute expired")
+        title, color = "🔊 Temporary Mute Expired", 0x00FF00
+    record_case(guild, user_id, bot.user, action, "Temporary action expired")
+    log_action(guild, bot.user, title, f"<@{user_id}> ({user_id})", color)
+
+expiry_scheduler = ExpiryScheduler(case_store, run_expiry, owns=owns_guild)
+
+async def schedule_expiry(guild, user_id, action, duration):
+    expires_at = datetime.now(timezone.utc) + parse_time(duration)
+    await expiry_scheduler.schedule(guild.id, user_id, action, expires_at.timestamp())
+    return expires_at
 
 # Configuration Command (Prefix & Slash)
-async def update_config(interaction, key, value):
-    config[key] = int(value) if value.isdigit() else value
-    with open(CONFIG_FILE, "w") as file:
-        json.dump(config, file, indent=4)
-    await interaction.response.send_message(f"✅ Configuration updated: {key} = {value}")
+async def update_config(responder, key, value):
+    if responder.guild is None:
+        return "⚠️ Configuration can only be changed inside a server."
+    await guild_store.set(responder.guild.id, key, int(value) if value.isdigit() else value)
+    return f"✅ Configuration updated: {key} = {value}"
 
 
 
@@ -277,310 +554,219 @@ async def update_config(interaction, key, value):
 
 @bot.tree.command(name="config", description="Update bot settings.")
 async def config_cmd(interaction: discord.Interaction, key: str, value: str):
-    await update_config(interaction, key, value)
+    await execute(interaction, update_config, key, value)
 
 @bot.command(name="config")
 async def config_prefix(ctx, key: str, value: str):
-    await update_config(ctx, key, value)
+    await execute(ctx, update_config, key, value)
 
-async def timeout_member(interaction, member, duration, reason="No reason provided"):
-    try:
-        await member.timeout(parse_time(duration), reason=reason)
-        await interaction.response.send_message(embed=discord.Embed(
-            title="⏲️ User Timed Out",
-            description=f"Timed out {member.mention} for {duration}. Reason: {reason}",
-            color=0xFF0000).set_footer(text=footer_text))
-    except Exception as e:
-        await interaction.response.send_message(f"Error: {str(e)}")
-
-@bot.tree.command(name="timeout", description="Timeout a user for a specific duration.")
-async def timeout(interaction: discord.Interaction, member: discord.Member, duration: str, reason: str = "No reason provided"):
-    await timeout_member(interaction, member, duration, reason)
-
-@bot.command(name="timeout")
-async def timeout_prefix(ctx, member: discord.Member, duration: str, *, reason="No reason provided"):
-    await timeout_member(ctx, member, duration, reason)
-
-#  Untimeout Command
-async def untimeout_member(interaction, member):
-    try:
-        await member.timeout(None)
-        await interaction.response.send_message(embed=discord.Embed(
-            title="✅ User Untimed Out",
-            description=f"Removed timeout from {member.mention}.",
-            color=0x00FF00).set_footer(text=footer_text))
-    except Exception as e:
-        await interaction.response.send_message(f"Error: {str(e)}")
-
-@bot.tree.command(name="untimeout", description="Remove timeout from a user.")
-async def untimeout(interaction: discord.Interaction, member: discord.Member):
-    await untimeout_member(interaction, member)
-
-@bot.command(name="untimeout")
-async def untimeout_prefix(ctx, member: discord.Member):
-    await untimeout_member(ctx, member)
-
-
-@bot.tree.command(name="rps", description="Play Rock, Paper, Scissors.")
-async def rps(interaction: discord.Interaction, choice: str):
-    choices = ["rock", "paper", "scissors"]
-    bot_choice = random.choice(choices)
-    result = "It's a tie!" if choice == bot_choice else "You win!" if (choice, bot_choice) in [("rock", "scissors"), ("paper", "rock"), ("scissors", "paper")] else "You lose!"
-    await interaction.response.send_message(f"🪨 {choice.capitalize()} vs {bot_choice.capitalize()} - {result}")
-
-@bot.tree.command(name="coinflip", description="Flip a coin.")
-async def coinflip(interaction: discord.Interaction):
-    result = random.choice(["Heads", "Tails"])
-    await interaction.response.send_message(f"🪙 Coin flip: **{result}**")
-
-@bot.tree.command(name="roll", description="Roll a 6-sided dice.")
-async def roll(interaction: discord.Interaction):
-    result = random.randint(1, 6)
-    await interaction.response.send_message(f"🎲 You rolled a **{result}**!")
-
-trivia_questions = [
-    ("What is the capital of France?", "Paris"),
-    ("Who wrote 'To Kill a Mockingbird'?", "Harper Lee"),
-    ("What planet is known as the Red Planet?", "Mars"),
-    ("What is the largest mammal?", "Blue whale"),
-    ("In which year did the Titanic sink?", "1912"),
-    ("What is the smallest country in the world?", "Vatican City"),
-    ("Who painted the Mona Lisa?", "Leonardo da Vinci"),
-    ("What is the longest river in the world?", "Amazon River"),
-    ("Which country is known as the Land of the Rising Sun?", "Japan"),
-    ("Who was the first president of the United States?", "George Washington"),
-    ("What is the hardest natural substance on Earth?", "Diamond"),
-    ("Which element has the chemical symbol 'O'?", "Oxygen"),
-    ("What is the capital of Australia?", "Canberra"),
-    ("Which ocean is the largest?", "Pacific Ocean"),
-    ("In which year did World War II end?", "1945"),
-    ("Who developed the theory of relativity?", "Albert Einstein"),
-    ("What is the name of the first man to walk on the moon?", "Neil Armstrong"),
-    ("What is the tallest mountain in the world?", "Mount Everest"),
-    ("Which animal is known as the King of the Jungle?", "Lion"),
-    ("Which planet is closest to the sun?", "Mercury"),
-    ("What is the longest bone in the human body?", "Femur"),
-    ("Who wrote 'Romeo and Juliet'?", "William Shakespeare"),
-    ("What is the capital of Japan?", "Tokyo"),
-    ("Which country invented the pizza?", "Italy"),
-    ("What is the largest desert in the world?", "Sahara Desert"),
-    ("In what year did the first manned moon landing take place?", "1969"),
-    ("Who discovered penicillin?", "Alexander Fleming"),
-    ("Which country is the largest by land area?", "Russia"),
-    ("What is the national flower of Japan?", "Cherry Blossom"),
-    ("Who was the first woman to win a Nobel Prize?", "Marie Curie"),
-    ("What is the chemical symbol for gold?", "Au"),
-    ("Which planet is known for its rings?", "Saturn"),
-    ("What is the main ingredient in guacamole?", "Avocado"),
-    ("Which ocean separates the United States from Europe?", "Atlantic Ocean"),
-    ("Which famous scientist developed the laws of motion?", "Isaac Newton"),
-    ("Who painted the Sistine Chapel ceiling?", "Michelangelo"),
-    ("What year did the Berlin Wall fall?", "1989"),
-    ("What is the world's most widely spoken language?", "Mandarin Chinese"),
-    ("Who is the author of the Harry Potter series?", "J.K. Rowling"),
-    ("Which animal can be seen on the Porsche logo?", "Horse"),
-    ("What is the capital of Canada?", "Ottawa"),
-    ("What is the world's largest island?", "Greenland"),
-    ("Which famous ship sank on its maiden voyage in 1912?", "Titanic"),
-    ("Which country is known as the 'Land of the Midnight Sun'?", "Norway"),
-    ("What element is represented by the symbol 'Na'?", "Sodium"),
-    ("What is the tallest building in the world?", "Burj Khalifa"),
-    ("Which continent is the Sahara Desert located on?", "Africa"),
-    ("Which chemical element has the atomic number 1?", "Hydrogen"),
-    ("What is the name of the fairy in Peter Pan?", "Tinker Bell"),
-    ("What is the smallest bone in the human body?", "Stapes"),
-    ("Who was the first woman to fly solo across the Atlantic Ocean?", "Amelia Earhart"),
-    ("What is the most common blood type?", "O positive"),
-    ("Which city is known as the Big Apple?", "New York City"),
-    ("Which country is known as the birthplace of democracy?", "Greece"),
-    ("Which animal is the largest land mammal?", "Elephant"),
-    ("What is the capital of Egypt?", "Cairo"),
-    ("Who invented the lightbulb?", "Thomas Edison"),
-    ("In what year did the first iPhone launch?", "2007"),
-    ("What is the largest volcano in the world?", "Mauna Loa"),
-    ("Which planet is known as the 'Giant Planet'?", "Jupiter"),
-    ("Which sea is the saltiest?", "Dead Sea"),
-    ("Who was the first emperor of China?", "Qin Shi Huang"),
-    ("What is the capital of Italy?", "Rome"),
-    ("Who was the first female Prime Minister of the United Kingdom?", "Margaret Thatcher"),
-    ("Which country has the most pyramids?", "Sudan"),
-    ("What is the capital of Brazil?", "Brasília"),
-    ("Which country is home to the Great Barrier Reef?", "Australia"),
-    ("Which sport is known as 'the king of sports'?", "Soccer"),
-    ("Who was the first African-American president of the United States?", "Barack Obama"),
-    ("What is the tallest waterfall in the world?", "Angel Falls"),
-    ("Which city is famous for its canals and gondolas?", "Venice"),
-    ("Which country is known as the Land of Ice and Fire?", "Iceland"),
-    ("Which country has the most official languages?", "South Africa"),
-    ("What is the capital of Spain?", "Madrid"),
-    ("What is the world's largest coral reef system?", "Great Barrier Reef"),
-    ("What is the national sport of Canada?", "Hockey"),
-    ("Who was the first man to climb Mount Everest?", "Sir Edmund Hillary"),
-    ("Which country is known for the invention of paper?", "China"),
-    ("What is the main ingredient of tofu?", "Soybeans"),
-    ("Who was the first person to reach the South Pole?", "Roald Amundsen"),
-    ("What is the smallest planet in our solar system?", "Mercury"),
-    ("Which bird is known for its colorful feathers and mimicking sounds?", "Parrot"),
-    ("Who discovered America?", "Christopher Columbus"),
-    ("What is the capital of Mexico?", "Mexico City"),
-    ("What does the acronym 'HTML' stand for?", "HyperText Markup Language"),
-    ("Which fruit has its seeds on the outside?", "Strawberry"),
-    ("What is the symbol for the chemical element carbon?", "C"),
-    ("What animal is featured in the logo of Ferrari?", "Horse"),
-    ("What is the largest country in Africa?", "Algeria"),
-    ("What is the national animal of Canada?", "Beaver"),
-    ("Who wrote 'Pride and Prejudice'?", "Jane Austen"),
-    ("Which country is famous for sushi?", "Japan"),
-    ("What is the highest recorded temperature on Earth?", "134°F (56.7°C)"),
-    ("What is the currency of the United Kingdom?", "Pound Sterling"),
-    ("What is the capital of India?", "New Delhi"),
-    ("Which planet is known as the Morning Star?", "Venus"),
-    ("Which element is represented by the symbol 'Fe'?", "Iron"),
-    ("What is the only continent without a desert?", "Europe"),
-    ("Who is known as the 'Father of Modern Physics'?", "Albert Einstein"),
-    ("Which country is the largest producer of coffee?", "Brazil"),
-    ("Which fruit is known as the king of fruits?", "Durian"),
-    ("What is the name of the largest moon of Saturn?", "Titan"),
-    ("Which American president issued the Emancipation Proclamation?", "Abraham Lincoln"),
-    ("What is the capital of South Korea?", "Seoul"),
-    ("Which country is famous for its ancient pyramids?", "Egypt")
-]
-
-
-
-@bot.tree.command(name="trivia", description="Answer a random trivia question.")
-async def trivia(interaction: discord.Interaction):
-    question, answer = random.choice(trivia_questions)  # Choose a random question-answer pair
-    bot.current_question = (question, answer)  # Store the current question and answer
-    await interaction.response.send_message(f"❓ {question}\n*(Type your answer below)*")
-
-@bot.event
-async def on_message(message):
-    if message.author == bot.user:
-        return
-
-    # Check if there is a current question stored
-    if hasattr(bot, "current_question"):
-        question, correct_answer = bot.current_question
+# -------------------------------
+# Message pipeline
+# -------------------------------
+# Stages run in order and stop at the first one that handles the message.
+# Prechecks are cheap attribute tests so most messages never reach a handler.
+# Leave gaps in the order numbers for new stages (automod, etc.).
+# Feature stages are added by their cog when it loads and removed on unload.
+message_pipeline = MessagePipeline()
+
+STAGE_MESSAGE_LOG = -10  # records snapshots, never handles; runs even for bots
+STAGE_IGNORE_BOTS = 0
+STAGE_ANTI_SPAM = 10
+STAGE_ANTI_LINK = 20
+STAGE_TRIVIA = 40
+STAGE_COMMANDS = 100
+
+@message_pipeline.stage("ignore_bots", STAGE_IGNORE_BOTS, precheck=lambda message: message.author.bot)
+async def ignore_bots_stage(message):
+    # Avoid the bot responding to itself or other bots
+    return True
 
-        # Check the answer (case insensitive)
-        if message.content.strip().lower() == correct_answer.lower():
-            await message.channel.send("✅ Correct!")
-            bot.current_question = None  # Clear after correct answer
-        else:
-            await message.channel.send(f"❌ Incorrect. The correct answer was: {correct_answer}.")
-            bot.current_question = None
+def might_be_command(message):
+    settings = guild_store.get_cached(message.guild.id) if message.guild else None
+    if settings is None:
+        # Not loaded yet; let get_prefix fetch it.
+        return bool(message.content)
+    return message.content.startswith(settings["prefix"])
 
+@message_pipeline.stage("commands", STAGE_COMMANDS, precheck=might_be_command)
+async def commands_stage(message):
     await bot.process_commands(message)
-
+    return True
 
 @bot.event
+@bot_metrics.instrument("on_message")
 async def on_message(message):
-    # Avoid the bot responding to itself or other bots
-    if message.author.bot:
-        return
-
-    # Anti-link check (if enabled)
-    if config["anti_link"] and "http" in message.content and not message.author.guild_permissions.administrator:
-        await message.delete()
-        await message.channel.send(embed=discord.Embed(
-            title="🚫 Anti-Link Protection",
-            description=f"{message.author.mention}, links are not allowed!",
-            color=0xFF0000).set_footer(text=footer_text))
-        return
-
-   
-    # Trivia answer check
-    for question, answer in trivia_questions:
-        if message.content.lower() == answer.lower():
-            await message.channel.send(f"🎉 Correct! The answer is **{answer}**.")
-            return
-
-    # Process other commands normally
-    await bot.process_commands(message)
-
-
-    # Process other bot commands
-    await bot.process_commands(message)
+    await message_pipeline.process(message)
+
+def pipeline_gauges():
+    stats = message_pipeline.stats()
+    gauges = [
+        ("solarvox_pipeline_stage_calls", "Messages that reached each pipeline stage.", "stage",
+         {name: calls for name, calls, _, _, _ in stats}),
+        ("solarvox_pipeline_stage_avg_ms", "Average pipeline stage time in ms.", "stage",
+         {name: avg for name, _, _, avg, _ in stats}),
+    ]
+    moderation = bot.get_cog("Moderation")
+    if moderation is not None:
+        gauges.append(("solarvox_pipeline_tracked_users", "Users with recent messages held by a stage.", "stage",
+                       {"anti_spam": len(moderation.spam_tracker)}))
+    return gauges
+
+bot_metrics.registry.add_collector(pipeline_gauges)
+
+@bot.tree.command(name="stats", description="Show command, event and REST metrics.")
+@app_commands.default_permissions(administrator=True)
+async def stats_cmd(interaction: discord.Interaction):
+    def latency_lines(family, errors, limit=10):
+        rows = sorted(family.children.items(), key=lambda item: item[1].total, reverse=True)[:limit]
+        return "\n".join(
+            f"`{name}` {hist.count}x, avg {hist.total / hist.count * 1000:.1f}ms, "
+            f"p99 ≤ {hist.quantile(0.99) * 1000:.0f}ms, {errors.child(name).value} errors"
+            for name, hist in rows if hist.count) or "No data yet."
+
+    routes = sorted(bot_metrics.rest_calls.children.items(), key=lambda item: item[1].value, reverse=True)[:10]
+    rest = "\n".join(
+        f"`{route}` {counter.value} calls, {bot_metrics.rest_429s.child(route).value} × 429"
+        for route, counter in routes) or "No data yet."
+    embed = discord.Embed(title="📊 Bot Stats", color=0x3498DB)
+    embed.add_field(name="Commands (by total time)", value=latency_lines(bot_metrics.command_latency, bot_metrics.command_errors)[:1024], inline=False)
+    embed.add_field(name="Events (by total time)", value=latency_lines(bot_metrics.event_latency, bot_metrics.event_errors)[:1024], inline=False)
+    embed.add_field(name="REST routes", value=rest[:1024], inline=False)
+    await interaction.response.send_message(embed=embed.set_footer(text=footer_text), ephemeral=True)
+
+def process_rss():
+    """Resident memory in bytes, or None where it can't be read."""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current; kilobytes on Linux, bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+@bot.tree.command(name="memory", description="Show process memory and cache sizes per server.")
+@app_commands.default_permissions(administrator=True)
+async def memory_cmd(interaction: discord.Interaction):
+    guilds = sorted(bot.guilds, key=lambda guild: len(guild.members), reverse=True)
+    moderation, trivia = bot.get_cog("Moderation"), bot.get_cog("Trivia")
+    rss = process_rss()
+    embed = discord.Embed(
+        title="🧠 Memory",
+        description=f"RSS: **{f'{rss / 2**20:.1f} MiB' if rss else 'unknown'}**\n"
+                    f"Gateway mode: **{'lean' if LEAN_GATEWAY else 'full'}**",
+        color=0x3498DB)
+    embed.add_field(name="Discord cache", value=(
+        f"{len(bot.guilds)} servers\n"
+        f"{sum(len(guild.members) for guild in guilds)} members, {len(bot.users)} users\n"
+        f"{sum(len(guild.channels) for guild in guilds)} channels, {sum(len(guild.roles) for guild in guilds)} roles"))
+    embed.add_field(name="Bot caches", value=(
+        f"{len(guild_store)} server settings\n"
+        f"{len(message_snapshots)} message snapshots in {message_snapshots.channels} channels "
+        f"(~{message_snapshots.used / 2**20:.1f} MiB)\n"
+        f"{len(moderation.spam_tracker) if moderation else 0} anti-spam users\n"
+        f"{len(trivia.sessions) if trivia else 0} trivia sessions\n"
+        f"{len(expiry_scheduler)} pending expiries"))
+    lines = [f"**{guild.name}**: {len(guild.members)}/{guild.member_count or 0} members, "
+             f"{len(guild.channels)} channels, {len(guild.roles)} roles"
+             for guild in guilds[:10]]
+    embed.add_field(name="Largest servers", value="\n".join(lines)[:1024] or "None", inline=False)
+    await interaction.response.send_message(embed=embed.set_footer(text=footer_text), ephemeral=True)
+
+@bot.tree.command(name="stalls", description="Show recent event-loop stalls and what caused them.")
+@app_commands.default_permissions(administrator=True)
+async def stalls_cmd(interaction: discord.Interaction):
+    stalls = list(loop_watchdog.stalls)[::-1]
+    embed = discord.Embed(
+        title="🐢 Event Loop Stalls",
+        description=f"{loop_watchdog.stall_count} stalls over {loop_watchdog.threshold * 1000:.0f}ms since start, "
+                    f"worst lag {loop_watchdog.max_lag * 1000:.0f}ms.",
+        color=0xFFAA00 if stalls else 0x00FF00)
+    if stalls:
+        embed.add_field(name="Recent", value="\n".join(
+            f"<t:{int(stall.at)}:R> **{stall.duration * 1000:.0f}ms** in `{stall.handler}` ({stall.where})"
+            for stall in stalls[:10])[:1024], inline=False)
+        if stalls[0].stack:
+            embed.add_field(name="Latest stack", value=f"```\n{''.join(stalls[0].stack)[-1000:]}\n```", inline=False)
+    await interaction.response.send_message(embed=embed.set_footer(text=footer_text), ephemeral=True)
+
+@bot.command(name="pipeline", help="Show message pipeline stage timings.")
+@commands.has_permissions(administrator=True)
+async def pipeline_prefix(ctx):
+    lines = [f"{name:<12} {calls:>8} {handled:>8} {avg:>9.3f} {peak:>9.3f}"
+             for name, calls, handled, avg, peak in message_pipeline.stats()]
+    header = f"{'stage':<12} {'calls':>8} {'handled':>8} {'avg ms':>9} {'max ms':>9}"
+    await ctx.send("```\n" + "\n".join([header] + lines) + "\n```")
 
 
+# -------------------------------
+# Help
+# -------------------------------
+# Pages are built once from the registered commands (see setup_hook) and
+# paged with one persistent view. Its buttons have fixed custom_ids and read
+# the current page from the embed footer, so old help messages keep working
+# after a restart.
+HELP_LINES_PER_PAGE = 12
+HELP_FOOTER = "Page {page}/{total} • Use the buttons below to navigate pages."
+HELP_PAGE_RE = re.compile(r"^Page (\d+)/")
+help_pages = []
+help_view = None
+
+def slash_usage(command):
+    params = " ".join(f"<{param.display_name}>" if param.required else f"[{param.display_name}]"
+                      for param in command.parameters)
+    return f"/{command.qualified_name} {params}".rstrip()
+
+def build_help_pages():
+    prefix_lines = []
+    for command in sorted(bot.commands, key=lambda command: command.name):
+        if command.hidden:
+            continue
+        slash = bot.tree.get_command(command.name)
+        description = command.short_doc or (slash.description if slash else "")
+        usage = f"C!{command.name} {command.signature}".rstrip()
+        prefix_lines.append(f"- `{usage}` - {description}" if description else f"- `{usage}`")
+    slash_lines = [f"- `{slash_usage(command)}` - {command.description}"
+                   for command in sorted(bot.tree.walk_commands(), key=lambda command: command.qualified_name)
+                   if not isinstance(command, app_commands.Group)]
+    pages = []
+    for title, lines in (("Prefix Commands (C!)", prefix_lines), ("Slash Commands (/)", slash_lines)):
+        for chunk in pack_lines(lines, max_lines=HELP_LINES_PER_PAGE):
+            pages.append(f"**Bot - {title}**:\n" + "\n".join(chunk))
+    help_pages[:] = [
+        discord.Embed(title="Help", description=text, color=0x3498DB).set_footer(
+            text=HELP_FOOTER.format(page=number, total=len(pages)))
+        for number, text in enumerate(pages, start=1)]
+
+def help_page_of(message):
+    """Zero-based page shown in a help message, read from its footer."""
+    embed = message.embeds[0] if message and message.embeds else None
+    match = HELP_PAGE_RE.match(embed.footer.text or "") if embed else None
+    return int(match.group(1)) - 1 if match else 0
+
+class HelpPaginator(View):
+    def __init__(self):
+        super().__init__(timeout=None)
+
+    async def turn(self, interaction: discord.Interaction, step):
+        page = (help_page_of(interaction.message) + step) % len(help_pages)
+        await interaction.response.edit_message(embed=help_pages[page])
+
+    @discord.ui.button(label="< Previous", style=discord.ButtonStyle.primary, custom_id="solarvox:help:previous")
+    async def previous_page(self, interaction: discord.Interaction, button: Button):
+        await self.turn(interaction, -1)
+
+    @discord.ui.button(label="Next >", style=discord.ButtonStyle.primary, custom_id="solarvox:help:next")
+    async def next_page(self, interaction: discord.Interaction, button: Button):
+        await self.turn(interaction, 1)
 
-# Help Command with two pages
 @bot.tree.command(name="help", description="Show help for commands.")
 async def help_cmd(interaction: discord.Interaction):
-    # Define the help pages
-    page1 = """
-    **Bot - Prefix Commands (C!)**:
-    - `C!ping` - Check the bot's latency.
-    - `C!8ball [question]` - Ask the magic 8-ball a question.
-    - `C!ban [user] [reason]` - Ban a user.
-    - `C!kick [user] [reason]` - Kick a user.
-    - `C!mute [user] [reason]` - Mute a user.
-    - `C!unmute [user]` - Unmute a user.
-    - `C!unban [user_id] [reason]` - Unban a user.
-    - `C!timeout [user] [duration] [reason]` - Timeout a user.
-    - `C!untimeout [user]` - Remove timeout from a user.
-    - `C!setup_ticket` - Set up the ticket panel.
-    - `C!config [key] [value]` - Update bot configuration.
-    - `C!pfp_steal [user]` - Steal someone's profile picture.
-    """
-
-    page2 = """
-    **Bot - Slash Commands (/)**:
-    - `/ping` - Check the bot's latency.
-    - `/8ball [question]` - Ask the magic 8-ball a question.
-    - `/ban [user] [reason]` - Ban a user.
-    - `/kick [user] [reason]` - Kick a user.
-    - `/mute [user] [reason]` - Mute a user.
-    - `/unmute [user]` - Unmute a user.
-    - `/unban [user_id] [reason]` - Unban a user.
-    - `/timeout [user] [duration] [reason]` - Timeout a user.
-    - `/untimeout [user]` - Remove timeout from a user.
-    - `/rps [choice]` - Play Rock, Paper, Scissors.
-    - `/coinflip` - Flip a coin.
-    - `/roll` - Roll a 6-sided dice.
-    - `/trivia` - Answer a random trivia question.
-    - `/config [key] [value]` - Update bot configuration.
-    - `/pfp_steal [user]` - Steal someone's profile picture.
-    """
-
-    # Create the first page embed
-    embed1 = discord.Embed(
-        title="Help (Page 1)",
-        description=page1,
-        color=0x3498DB
-    ).set_footer(text="Use the buttons below to navigate pages.")
-
-    embed2 = discord.Embed(
-        title="Help (Page 2)",
-        description=page2,
-        color=0x3498DB
-    ).set_footer(text="Use the buttons below to navigate pages.")
-
-    # Create the buttons
-    button_prev = Button(label="< Previous", style=discord.ButtonStyle.primary)
-    button_next = Button(label="Next >", style=discord.ButtonStyle.primary)
-
-    # Create the view
-    view = View()
-
-    # Define button actions
-    async def on_prev_click(interaction: discord.Interaction):
-        await interaction.response.edit_message(embed=embed1, view=view)
-
-    async def on_next_click(interaction: discord.Interaction):
-        await interaction.response.edit_message(embed=embed2, view=view)
-
-    # Add actions to buttons
-    button_prev.callback = on_prev_click
-    button_next.callback = on_next_click
-
-    # Add buttons to view
-    view.add_item(button_prev)
-    view.add_item(button_next)
-
-    # Send the initial help message
-    await interaction.response.send_message(embed=embed1, view=view)
+    await interaction.response.send_message(embed=help_pages[0], view=help_view)
 
 
 # Error Handling
@@ -590,5 +776,12 @@ async def on_command_error(ctx, error):
 
 # Run the bot
 
-bot.run("") # Put You Discord Bot Token Here
+TOKEN = "" # Put You Discord Bot Token Here
+
+def main():
+    bot.run(TOKEN)
+    config_store.flush_sync()
+
+if __name__ == "__main__":
+    main()
 
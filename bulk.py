@@ -0,0 +1,150 @@
+"""
+Gary - SolarVox
+Rate-limit-aware scheduler for bulk moderation
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+"""
+
+import asyncio
+import time
+
+
+def retry_after_of(error):
+    """Return how long to back off for a rate-limit error, or None for other errors.
+
+    Works with discord.RateLimited (``retry_after``) and HTTPException with
+    status 429, as well as any stand-in that exposes the same attributes.
+    """
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is not None:
+        return float(retry_after)
+    if getattr(error, "status", None) == 429:
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        return float(headers.get("Retry-After", 1.0))
+    return None
+
+
+class Bucket:
+    """Fixed-window request budget for one rate-limit route."""
+
+    __slots__ = ("limit", "window", "remaining", "reset_at", "lock")
+
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self.remaining = limit
+        self.reset_at = 0.0
+        self.lock = asyncio.Lock()
+
+
+class BulkJob:
+    __slots__ = ("key", "bucket", "action", "attempts")
+
+    def __init__(self, key, bucket, action):
+        self.key = key
+        self.bucket = bucket
+        self.action = action
+        self.attempts = 0
+
+
+class BulkResult:
+    def __init__(self, total):
+        self.total = total
+        self.succeeded = []
+        self.failed = {}
+        self.rate_limited = 0
+
+    @property
+    def done(self):
+        return len(self.succeeded) + len(self.failed)
+
+
+class BulkScheduler:
+    """Runs many API actions with bounded concurrency and per-bucket budgets.
+
+    Each job names the bucket it spends from (for example ``"ban:<guild id>"``).
+    A bucket allows ``limit`` jobs per ``window`` seconds. The budget counts
+    jobs, not requests: it is meant for the one write each job makes, and any
+    lookups a job does first (such as fetching a member) go to other Discord
+    routes. When a job still gets a 429 anyway, that bucket is paused for the
+    returned retry-after and the job is queued again, up to ``max_retries`` times.
+    """
+
+    def __init__(self, concurrency=4, limit=5, window=5.0, max_retries=3,
+                 clock=time.monotonic, sleep=asyncio.sleep):
+        self.concurrency = concurrency
+        self.limit = limit
+        self.window = window
+        self.max_retries = max_retries
+        self.clock = clock
+        self.sleep = sleep
+        self._buckets = {}
+
+    def bucket(self, name):
+        bucket = self._buckets.get(name)
+        if bucket is None:
+            bucket = self._buckets[name] = Bucket(self.limit, self.window)
+        return bucket
+
+    async def _acquire(self, bucket):
+        async with bucket.lock:
+            while True:
+                now = self.clock()
+                if now >= bucket.reset_at:
+                    bucket.remaining = bucket.limit
+                    bucket.reset_at = now + bucket.window
+                if bucket.remaining > 0:
+                    bucket.remaining -= 1
+                    return
+                await self.sleep(bucket.reset_at - now)
+
+    async def run(self, jobs, on_progress=None):
+        """Run every job; ``on_progress(result)`` is awaited after each one settles.
+
+        If ``on_progress`` raises, the other workers are cancelled and the
+        error propagates, so callers should keep it from failing.
+        """
+        queue = asyncio.Queue()
+        for job in jobs:
+            queue.put_nowait(job)
+        result = BulkResult(queue.qsize())
+
+        async def worker():
+            while True:
+                try:
+                    job = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                bucket = self.bucket(job.bucket)
+                await self._acquire(bucket)
+                job.attempts += 1
+                try:
+                    await job.action()
+                except Exception as e:
+                    retry_after = retry_after_of(e)
+                    if retry_after is None or job.attempts > self.max_retries:
+                        result.failed[job.key] = str(e)
+                    else:
+                        result.rate_limited += 1
+                        bucket.remaining = 0
+                        bucket.reset_at = max(bucket.reset_at, self.clock() + retry_after)
+                        queue.put_nowait(job)
+                        continue
+                else:
+                    result.succeeded.append(job.key)
+                if on_progress is not None:
+                    await on_progress(result)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(min(self.concurrency, result.total) or 1)]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            # One worker failed (or we were cancelled): stop the rest before re-raising.
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+        return result
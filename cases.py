@@ -0,0 +1,195 @@
+"""
+Gary - SolarVox
+Moderation case store
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+"""
+
+import asyncio
+import sqlite3
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+Case = namedtuple("Case", "guild_id case_id user_id moderator_id action reason duration created_at")
+
+_COLUMNS = "guild_id, case_id, user_id, moderator_id, action, reason, duration, created_at"
+
+
+class CaseStore:
+    """Every moderation action as a numbered case in a local SQLite file.
+
+    ``add()`` only queues the case; queued cases are inserted in one
+    transaction every ``flush_interval`` seconds on a worker thread. Case
+    numbers count up per guild and are assigned inside that transaction, so
+    several cluster workers can share the file. The table is clustered on
+    ``(guild_id, case_id)`` with indexes for user, moderator and time, and
+    pages are fetched by case number rather than OFFSET, so a lookup costs
+    the same at a hundred cases or a few million.
+    """
+
+    def __init__(self, path="solarvox_cases.db", flush_interval=1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="solarvox-cases")
+        self._conn = None
+        self._pending = []
+        self._task = None
+        self._lock = None
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def run_db(self, func, *args):
+        """Run ``func(conn, *args)`` on the store's database thread.
+
+        Other tables in the same file (see expiry.py) go through here rather
+        than opening a second connection and thread. Only valid between
+        ``start()`` and ``close()``.
+        """
+        return await self._run(lambda: func(self._conn, *args))
+
+    async def start(self):
+        self._lock = asyncio.Lock()
+        await self._run(self._db_open)
+        self._task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    def add(self, guild_id, user_id, moderator_id, action, reason=None, duration=None):
+        self._pending.append((guild_id, user_id, moderator_id, action, reason, duration, time.time()))
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f" Error writing moderation cases: {e}")
+
+    async def flush(self):
+        async with self._lock:
+            if not self._pending:
+                return
+            rows, self._pending = self._pending, []
+            try:
+                await self._run(self._db_insert_many, rows)
+            except Exception:
+                self._pending[:0] = rows
+                raise
+
+    async def get(self, guild_id, case_id):
+        await self.flush()
+        return await self._run(self._db_get, guild_id, case_id)
+
+    async def history(self, guild_id, user_id=None, moderator_id=None, since=None,
+                      before=None, after=None, limit=10):
+        """Up to ``limit`` cases, newest first.
+
+        ``before``/``after`` are case numbers to page from; ``since`` is a
+        Unix timestamp.
+        """
+        await self.flush()
+        return await self._run(self._db_history, guild_id, user_id, moderator_id, since, before, after, limit)
+
+    async def count(self, guild_id, user_id=None, moderator_id=None, since=None):
+        await self.flush()
+        return await self._run(self._db_count, guild_id, user_id, moderator_id, since)
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        try:
+            await self.flush()
+        finally:
+            await self._run(self._db_close)
+            self._executor.shutdown(wait=False)
+
+    # Blocking database side, only called on the worker thread
+    def _db_open(self):
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cases ("
+                "guild_id INTEGER NOT NULL, case_id INTEGER NOT NULL, user_id INTEGER NOT NULL, "
+                "moderator_id INTEGER NOT NULL, action TEXT NOT NULL, reason TEXT, duration TEXT, "
+                "created_at REAL NOT NULL, PRIMARY KEY (guild_id, case_id)) WITHOUT ROWID"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cases_user ON cases (guild_id, user_id, case_id)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cases_moderator ON cases (guild_id, moderator_id, case_id)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cases_time ON cases (guild_id, created_at)")
+
+    def _db_insert_many(self, rows):
+        # BEGIN IMMEDIATE takes the write lock up front, so the case numbers
+        # read here can't be taken by another process before we insert.
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            next_ids = {}
+            values = []
+            for guild_id, *fields in rows:
+                case_id = next_ids.get(guild_id)
+                if case_id is None:
+                    (last,) = self._conn.execute(
+                        "SELECT COALESCE(MAX(case_id), 0) FROM cases WHERE guild_id = ?", (guild_id,)).fetchone()
+                    case_id = last + 1
+                next_ids[guild_id] = case_id + 1
+                values.append((guild_id, case_id, *fields))
+            self._conn.executemany(f"INSERT INTO cases ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", values)
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _db_get(self, guild_id, case_id):
+        row = self._conn.execute(
+            f"SELECT {_COLUMNS} FROM cases WHERE guild_id = ? AND case_id = ?", (guild_id, case_id)).fetchone()
+        return Case._make(row) if row else None
+
+    def _where(self, guild_id, user_id, moderator_id, since):
+        # Without statistics SQLite prefers walking the primary key to skip a
+        # sort, which reads every case in the guild; name the index instead.
+        table = "cases"
+        clauses, args = ["guild_id = ?"], [guild_id]
+        if user_id is not None:
+            table = "cases INDEXED BY cases_user"
+            clauses.append("user_id = ?")
+            args.append(user_id)
+        if moderator_id is not None:
+            if user_id is None:
+                table = "cases INDEXED BY cases_moderator"
+            clauses.append("moderator_id = ?")
+            args.append(moderator_id)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            args.append(since)
+        return table, clauses, args
+
+    def _db_history(self, guild_id, user_id, moderator_id, since, before, after, limit):
+        table, clauses, args = self._where(guild_id, user_id, moderator_id, since)
+        order = "DESC"
+        if before is not None:
+            clauses.append("case_id < ?")
+            args.append(before)
+        elif after is not None:
+            # Walk forwards from ``after``, then flip back to newest first.
+            clauses.append("case_id > ?")
+            args.append(after)
+            order = "ASC"
+        rows = self._conn.execute(
+            f"SELECT {_COLUMNS} FROM {table} WHERE {' AND '.join(clauses)} ORDER BY case_id {order} LIMIT ?",
+            (*args, limit)).fetchall()
+        if order == "ASC":
+            rows.reverse()
+        return [Case._make(row) for row in rows]
+
+    def _db_count(self, guild_id, user_id, moderator_id, since):
+        table, clauses, args = self._where(guild_id, user_id, moderator_id, since)
+        return self._conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {' AND '.join(clauses)}", args).fetchone()[0]
+
+    def _db_close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,292 @@
+"""
+Gary - SolarVox
+Multi-process shard cluster launcher
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+
+Usage:
+    python cluster.py --workers 4 --shards 16
+    python cluster.py --workers 3 --shards 6 --fake    # offline, no Discord connection
+
+Each worker process runs botcore.py as an AutoShardedBot that owns a
+contiguous range of shards. Workers report their stats to this supervisor
+over a pipe; the supervisor adds them up and sends the cluster totals back to
+every worker for the status text and /cluster command. Every guild lives on
+exactly one shard, so per-guild settings are only ever cached by one worker
+and the shared storage backend needs no cross-process invalidation.
+"""
+
+import argparse
+import asyncio
+import math
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from multiprocessing.connection import wait
+
+STATS_INTERVAL = 5.0
+RESTART_DELAY = 10.0
+SHUTDOWN_TIMEOUT = 30.0
+
+
+def shard_ranges(shard_count, workers):
+    """Split ``range(shard_count)`` into ``workers`` contiguous, near-even lists."""
+    if shard_count < 1 or workers < 1:
+        raise ValueError("shard_count and workers must be at least 1")
+    workers = min(workers, shard_count)
+    per_worker, extra = divmod(shard_count, workers)
+    ranges, start = [], 0
+    for index in range(workers):
+        size = per_worker + (1 if index < extra else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return ranges
+
+
+class StatsAggregator:
+    """Latest stats from each worker, plus cluster-wide totals."""
+
+    def __init__(self):
+        self.workers = {}
+
+    def update(self, cluster_id, stats):
+        self.workers[cluster_id] = dict(stats, updated=time.monotonic())
+
+    def remove(self, cluster_id):
+        self.workers.pop(cluster_id, None)
+
+    def totals(self):
+        workers = self.workers.values()
+        latencies = [stats["latency"] for stats in workers if stats.get("latency") is not None
+                     and math.isfinite(stats["latency"])]
+        return {
+            "workers": len(self.workers),
+            "shards": sum(len(stats.get("shards", ())) for stats in workers),
+            "guilds": sum(stats.get("guilds", 0) for stats in workers),
+            "events_per_sec": sum(stats.get("events_per_sec", 0.0) for stats in workers),
+            "latency": sum(latencies) / len(latencies) if latencies else None,
+            "max_latency": max(latencies) if latencies else None,
+            "per_worker": {cluster_id: {key: value for key, value in stats.items() if key != "updated"}
+                           for cluster_id, stats in sorted(self.workers.items())},
+        }
+
+
+class WorkerLink:
+    """Worker side of the pipe to the supervisor.
+
+    One daemon thread blocks on the pipe and hands totals to the event loop;
+    another sends whatever ``send_stats`` queues, so the loop never waits on
+    IPC even when the supervisor is slow to read. A "shutdown" message or
+    SIGTERM calls ``on_shutdown`` on the loop so the bot can close cleanly.
+    """
+
+    def __init__(self, conn, cluster_id):
+        self.conn = conn
+        self.cluster_id = cluster_id
+        self.totals = None
+        self._outbox = queue.SimpleQueue()
+
+    def start(self, loop, on_shutdown):
+        def writer():
+            while True:
+                message = self._outbox.get()
+                try:
+                    self.conn.send(message)
+                except (BrokenPipeError, OSError):
+                    return
+
+        def reader():
+            while True:
+                try:
+                    kind, payload = self.conn.recv()
+                except (EOFError, OSError):
+                    return
+                if kind == "totals":
+                    loop.call_soon_threadsafe(setattr, self, "totals", payload)
+                elif kind == "shutdown":
+                    loop.call_soon_threadsafe(on_shutdown)
+
+        threading.Thread(target=reader, name="solarvox-cluster-ipc", daemon=True).start()
+        threading.Thread(target=writer, name="solarvox-cluster-ipc-send", daemon=True).start()
+        try:
+            loop.add_signal_handler(signal.SIGTERM, on_shutdown)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows: the pipe message is the only way in
+
+    def send_stats(self, stats):
+        self._outbox.put(("stats", stats))
+
+
+def run_worker(cluster_id, shard_ids, shard_count, conn):
+    os.environ["SOLARVOX_CLUSTER_ID"] = str(cluster_id)
+    os.environ["SOLARVOX_SHARD_IDS"] = ",".join(map(str, shard_ids))
+    os.environ["SOLARVOX_SHARD_COUNT"] = str(shard_count)
+    import botcore
+
+    botcore.cluster_link = WorkerLink(conn, cluster_id)
+    botcore.main()
+
+
+def run_fake_worker(cluster_id, shard_ids, shard_count, conn, interval=STATS_INTERVAL):
+    """Gateway stand-in: reports made-up but deterministic stats per shard."""
+    link = WorkerLink(conn, cluster_id)
+
+    async def fake_bot():
+        stopping = asyncio.Event()
+        link.start(asyncio.get_running_loop(), stopping.set)
+        while not stopping.is_set():
+            link.send_stats({
+                "shards": shard_ids,
+                "guilds": sum(100 + shard_id for shard_id in shard_ids),
+                "latency": 0.05 + cluster_id / 100,
+                "events_per_sec": 10.0 * len(shard_ids),
+            })
+            try:
+                await asyncio.wait_for(stopping.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+    try:
+        asyncio.run(fake_bot())
+    except KeyboardInterrupt:
+        pass
+
+
+class Supervisor:
+    def __init__(self, workers, shard_count, target=run_worker, interval=STATS_INTERVAL):
+        self.shard_count = shard_count
+        self.ranges = shard_ranges(shard_count, workers)
+        self.target = target
+        self.interval = interval
+        self.aggregator = StatsAggregator()
+        self._procs = {}
+        self._conns = {}
+
+    def _spawn(self, cluster_id):
+        parent_conn, child_conn = multiprocessing.Pipe()
+        proc = multiprocessing.Process(
+            target=self.target, name=f"solarvox-cluster-{cluster_id}",
+            args=(cluster_id, self.ranges[cluster_id], self.shard_count, child_conn))
+        proc.start()
+        child_conn.close()
+        self._procs[cluster_id] = proc
+        self._conns[cluster_id] = parent_conn
+        print(f" Started cluster {cluster_id} with shards {self.ranges[cluster_id]} (pid {proc.pid})")
+
+    def _broadcast(self):
+        totals = self.aggregator.totals()
+        for conn in list(self._conns.values()):
+            try:
+                conn.send(("totals", totals))
+            except (BrokenPipeError, OSError):
+                pass
+
+    def _reap(self, restarts):
+        for cluster_id, proc in list(self._procs.items()):
+            if proc.is_alive():
+                continue
+            print(f" Cluster {cluster_id} exited with code {proc.exitcode}; restarting in {RESTART_DELAY:.0f}s.")
+            self._conns.pop(cluster_id).close()
+            del self._procs[cluster_id]
+            self.aggregator.remove(cluster_id)
+            restarts[cluster_id] = time.monotonic() + RESTART_DELAY
+
+    def run(self, duration=None):
+        """Run until interrupted (or for ``duration`` seconds) and return the last totals."""
+        for cluster_id in range(len(self.ranges)):
+            self._spawn(cluster_id)
+        restarts = {}
+        deadline = time.monotonic() + duration if duration else None
+        next_broadcast = time.monotonic() + self.interval
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                by_conn = {conn: cluster_id for cluster_id, conn in self._conns.items()}
+                for conn in wait(list(by_conn), timeout=1.0):
+                    try:
+                        kind, payload = conn.recv()
+                    except (EOFError, OSError):
+                        continue
+                    if kind == "stats":
+                        self.aggregator.update(by_conn[conn], payload)
+                self._reap(restarts)
+                now = time.monotonic()
+                for cluster_id, when in list(restarts.items()):
+                    if now >= when:
+                        del restarts[cluster_id]
+                        self._spawn(cluster_id)
+                if now >= next_broadcast:
+                    next_broadcast = now + self.interval
+                    self._broadcast()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+        return self.aggregator.totals()
+
+    def stop(self, timeout=SHUTDOWN_TIMEOUT):
+        # Ask each worker to close its bot, so queued settings and cases are
+        # written, and only terminate the ones that don't exit in time.
+        for conn in self._conns.values():
+            try:
+                conn.send(("shutdown", None))
+            except (BrokenPipeError, OSError):
+                pass
+        deadline = time.monotonic() + timeout
+        for proc in self._procs.values():
+            proc.join(timeout=max(0.0, deadline - time.monotonic()))
+        for cluster_id, proc in self._procs.items():
+            if proc.is_alive():
+                print(f" Cluster {cluster_id} did not shut down within {timeout:.0f}s; terminating it.")
+                proc.terminate()
+                proc.join(timeout=5)
+        for conn in self._conns.values():
+            conn.close()
+        self._procs.clear()
+        self._conns.clear()
+
+
+def prepare_storage():
+    """Move leftover per-guild sections out of config.json before any worker starts."""
+    from config_store import ConfigStore
+    from storage import GuildStore, create_backend
+
+    store = ConfigStore("config.json")
+
+    async def migrate():
+        guild_store = GuildStore(create_backend(store.data.get("storage")), {})
+        await guild_store.start()
+        try:
+            if await guild_store.migrate_from_config(store.data):
+                store.mark_dirty()
+        finally:
+            await guild_store.close()
+
+    asyncio.run(migrate())
+    store.flush_sync()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Gary across several processes.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="number of worker processes")
+    parser.add_argument("--shards", type=int, default=None, help="total shard count (default: one per worker)")
+    parser.add_argument("--fake", action="store_true", help="use the offline gateway stand-in")
+    parser.add_argument("--duration", type=float, default=None, help="stop after this many seconds")
+    args = parser.parse_args()
+
+    shard_count = args.shards or args.workers
+    if args.fake:
+        supervisor = Supervisor(args.workers, shard_count, target=run_fake_worker, interval=1.0)
+    else:
+        prepare_storage()
+        supervisor = Supervisor(args.workers, shard_count)
+    totals = supervisor.run(duration=args.duration)
+    print(f" Cluster totals: {totals['workers']} workers, {totals['shards']} shards, {totals['guilds']} guilds")
+
+
+if __name__ == "__main__":
+    main()
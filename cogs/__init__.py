@@ -0,0 +1,8 @@
+"""
+Gary - SolarVox
+Feature cogs, loaded as extensions by botcore
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+"""
@@ -0,0 +1,77 @@
+"""
+Gary - SolarVox
+Fun commands
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+"""
+
+import random
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from botcore import footer_text
+
+EIGHT_BALL_RESPONSES = ["Yes", "No", "Maybe", "Definitely", "I don't know"]
+
+
+class Fun(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @app_commands.command(name="ping", description="Check the bot's latency.")
+    async def ping(self, interaction: discord.Interaction):
+        latency = round(self.bot.latency * 1000)
+        await interaction.response.send_message(f"🏓 Pong! Latency: '''{latency}ms'''")
+
+    @commands.command(name="ping")
+    async def ping_prefix(self, ctx):
+        latency = round(self.bot.latency * 1000)
+        await ctx.send(f"🏓 Pong! Latency: '''{latency}ms'''")
+
+    @app_commands.command(name="8ball", description="Ask the magic 8-ball a question.")
+    async def eight_ball(self, interaction: discord.Interaction, question: str):
+        await interaction.response.send_message(embed=discord.Embed(
+            title="🎱 Magic 8-Ball",
+            description=f"Question: {question}\nAnswer: {random.choice(EIGHT_BALL_RESPONSES)}",
+            color=0x2ECC71).set_footer(text=footer_text))
+
+    @commands.command(name="8ball")
+    async def eightball_prefix(self, ctx, question: str):
+        await ctx.send(f"🎱 Magic 8-Ball says: {random.choice(EIGHT_BALL_RESPONSES)}")
+
+    # Image Manipulation Command (PFP Steal)
+    @app_commands.command(name="pfp_steal", description="Steal someone's profile picture.")
+    async def pfp_steal(self, interaction: discord.Interaction, member: discord.Member):
+        await interaction.response.send_message(embed=discord.Embed(
+            title=f"🖼️ {member.name}'s Profile Picture",
+            description=f"Here's {member.name}'s profile picture:",
+            color=0xFF69B4).set_image(url=member.display_avatar.url).set_footer(text=footer_text))
+
+    @commands.command(name="pfp_steal")
+    async def pfp_steal_prefix(self, ctx, member: discord.Member):
+        await ctx.send(f"🖼️ {member.name}'s Profile Picture: {member.display_avatar.url}")
+
+    @app_commands.command(name="rps", description="Play Rock, Paper, Scissors.")
+    async def rps(self, interaction: discord.Interaction, choice: str):
+        choices = ["rock", "paper", "scissors"]
+        bot_choice = random.choice(choices)
+        result = "It's a tie!" if choice == bot_choice else "You win!" if (choice, bot_choice) in [("rock", "scissors"), ("paper", "rock"), ("scissors", "paper")] else "You lose!"
+        await interaction.response.send_message(f"🪨 {choice.capitalize()} vs {bot_choice.capitalize()} - {result}")
+
+    @app_commands.command(name="coinflip", description="Flip a coin.")
+    async def coinflip(self, interaction: discord.Interaction):
+        result = random.choice(["Heads", "Tails"])
+        await interaction.response.send_message(f"🪙 Coin flip: **{result}**")
+
+    @app_commands.command(name="roll", description="Roll a 6-sided dice.")
+    async def roll(self, interaction: discord.Interaction):
+        result = random.randint(1, 6)
+        await interaction.response.send_message(f"🎲 You rolled a **{result}**!")
+
+
+async def setup(bot):
+    await bot.add_cog(Fun(bot))
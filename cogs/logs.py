@@ -0,0 +1,122 @@
+"""
+Gary - SolarVox
+Delete, edit and purge logging
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+"""
+
+import discord
+from discord.ext import commands
+
+from botcore import (
+    STAGE_MESSAGE_LOG, bot_metrics, footer_text, guild_store, message_pipeline, message_snapshots, mod_log,
+    resolved,
+)
+
+# Deleted and edited messages are logged from our own snapshots (see
+# snapshots.py) rather than discord.py's message cache. The snapshot cache
+# lives in botcore, so reloading this cog keeps what has been recorded.
+
+def might_be_logged(message):
+    if message.guild is None:
+        return False
+    settings = guild_store.get_cached(message.guild.id)
+    return settings is None or bool(settings["log_channel"])
+
+def channel_label(guild, channel_id):
+    channel = guild.get_channel_or_thread(channel_id)
+    return f"#{channel.name}" if channel else str(channel_id)
+
+
+class Logs(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def cog_load(self):
+        message_pipeline.add_stage("message_log", STAGE_MESSAGE_LOG, self.snapshot_stage, might_be_logged)
+
+    async def cog_unload(self):
+        message_pipeline.remove_stage("message_log")
+
+    async def snapshot_stage(self, message):
+        message_snapshots.add(message.id, message.author.id, message.channel.id, message.content,
+                              [attachment.url for attachment in message.attachments])
+        return False
+
+    async def logged_guild(self, guild_id):
+        """The guild, if it has a log channel we can post in."""
+        guild = self.bot.get_guild(guild_id) if guild_id else None
+        if guild is None or not resolved.channel(guild, await guild_store.get_value(guild_id, "log_channel")):
+            return None
+        return guild
+
+    @commands.Cog.listener()
+    @bot_metrics.instrument("on_raw_message_delete")
+    async def on_raw_message_delete(self, payload):
+        snapshot = message_snapshots.pop(payload.channel_id, payload.message_id)
+        guild = await self.logged_guild(payload.guild_id)
+        if guild is None:
+            return
+        if snapshot is None:
+            description = f"Message `{payload.message_id}` was not cached, so its content is unknown."
+        else:
+            description = f"**Author:** <@{snapshot.author_id}>\n**Content:** {snapshot.content}"
+            if snapshot.attachments:
+                description += "\n**Attachments:**\n" + "\n".join(snapshot.attachments)
+        embed = discord.Embed(title="🗑️ Message Deleted", description=description[:4096], color=0xFF4500)
+        embed.set_footer(text=f"{footer_text} | Channel: {channel_label(guild, payload.channel_id)}")
+        mod_log.log(guild.id, embed)
+
+    @commands.Cog.listener()
+    @bot_metrics.instrument("on_raw_message_edit")
+    async def on_raw_message_edit(self, payload):
+        # payload.data is the raw gateway dict on every discord.py version we
+        # support (payload.message only exists from 2.5 on).
+        after = payload.data.get("content")
+        snapshot = message_snapshots.get(payload.channel_id, payload.message_id)
+        if after is None or snapshot is None:
+            return  # Not held, or an embed/pin update without the text
+        before = snapshot.content
+        if before == after[:message_snapshots.max_content]:
+            return
+        message_snapshots.update(payload.channel_id, payload.message_id, after)
+        guild = await self.logged_guild(payload.guild_id)
+        if guild is None:
+            return
+        jump_url = f"https://discord.com/channels/{guild.id}/{payload.channel_id}/{payload.message_id}"
+        embed = discord.Embed(title="✏️ Message Edited", color=0xFFA500,
+                              description=f"**Author:** <@{snapshot.author_id}> • [Jump to message]({jump_url})")
+        embed.add_field(name="Before", value=before[:1024] or "*empty*", inline=False)
+        embed.add_field(name="After", value=after[:1024] or "*empty*", inline=False)
+        embed.set_footer(text=f"{footer_text} | Channel: {channel_label(guild, payload.channel_id)}")
+        mod_log.log(guild.id, embed)
+
+    @commands.Cog.listener()
+    @bot_metrics.instrument("on_raw_bulk_message_delete")
+    async def on_raw_bulk_message_delete(self, payload):
+        snapshots = [message_snapshots.pop(payload.channel_id, message_id) for message_id in sorted(payload.message_ids)]
+        guild = await self.logged_guild(payload.guild_id)
+        if guild is None:
+            return
+        channel = guild.get_channel(payload.channel_id)
+        embed = discord.Embed(
+            title="🧹 Messages Purged",
+            description=f"**{len(payload.message_ids)}** messages deleted in {channel.mention if channel else payload.channel_id}.",
+            color=0xFF4500).set_footer(text=footer_text)
+        snapshots = [snapshot for snapshot in snapshots if snapshot is not None]
+        if not snapshots:
+            mod_log.log(guild.id, embed)
+            return
+        # Snowflakes carry their creation time, so the snapshot doesn't need to.
+        transcript = "\n".join(
+            f"[{discord.utils.snowflake_time(snapshot.id):%Y-%m-%d %H:%M:%S}] {snapshot.author_id}: {snapshot.content}"
+            + "".join(f" {url}" for url in snapshot.attachments)
+            for snapshot in snapshots)
+        embed.add_field(name="Transcript", value=f"{len(snapshots)} of them were cached; see the attachment.")
+        mod_log.log_file(guild.id, embed, f"purge-{payload.channel_id}.txt", transcript)
+
+
+async def setup(bot):
+    await bot.add_cog(Logs(bot))
@@ -0,0 +1,519 @@
+"""
+Gary - SolarVox
+Moderation: commands, cases, bulk actions and the automod pipeline stages
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+"""
+
+import asyncio
+import re
+from datetime import datetime, timezone
+
+import discord
+from discord import app_commands
+from discord.ext import commands, tasks
+from discord.ui import Button, View
+
+from antispam import SpamTracker
+from bulk import BulkJob, BulkScheduler
+from linkfilter import SNOWFLAKE_RE
+from responder import execute
+from botcore import (
+    MAX_TIMEOUT, STAGE_ANTI_LINK, STAGE_ANTI_SPAM, bot, case_settings, case_store, config,
+    expiry_scheduler, footer_text, guild_store, link_filter, log_action, message_pipeline, parse_time,
+    record_case, resolve_member, resolved, schedule_expiry, split_duration, valid_duration,
+)
+
+# Moderation Commands (Prefix & Slash)
+# Each helper does the work for both the slash and the prefix command and
+# returns the reply; execute() acknowledges the command and sends it.
+INVALID_DURATION = "⚠️ Invalid duration. Use a number followed by s, m, h, d or w (e.g. 7d)."
+
+async def ban_member(responder, member, reason, duration=None):
+    if duration and not valid_duration(duration):
+        return INVALID_DURATION
+    await member.ban(reason=reason)
+    record_case(member.guild, member.id, responder.user, "ban", reason, duration)
+    until = ""
+    if duration:
+        expires_at = await schedule_expiry(member.guild, member.id, "unban", duration)
+        until = f" until {discord.utils.format_dt(expires_at)}"
+    else:
+        await expiry_scheduler.cancel(member.guild.id, member.id, "unban")
+    log_action(member.guild, responder.user, "🔨 User Banned", f"{member.mention} ({member.id}){until}\n**Reason:** {reason}", 0xFF0000)
+    return discord.Embed(
+        title="🔨 User Banned",
+        description=f"Banned {member.mention}{until} for: {reason}",
+        color=0xFF0000).set_footer(text=footer_text)
+
+async def kick_member(responder, member, reason):
+    await member.kick(reason=reason)
+    record_case(member.guild, member.id, responder.user, "kick", reason)
+    log_action(member.guild, responder.user, "👢 User Kicked", f"{member.mention} ({member.id})\n**Reason:** {reason}", 0xFFAA00)
+    return discord.Embed(
+        title="👢 User Kicked",
+        description=f"Kicked {member.mention} for: {reason}",
+        color=0xFFAA00).set_footer(text=footer_text)
+
+async def unban_member(responder, user_id, reason):
+    # Unbanning only needs the ID; fetching the user first would be a
+    # second API call before the first one could start.
+    guild = responder.guild
+    await guild.unban(discord.Object(id=user_id), reason=reason)
+    await expiry_scheduler.cancel(guild.id, user_id, "unban")
+    record_case(guild, user_id, responder.user, "unban", reason)
+    log_action(guild, responder.user, "🔓 User Unbanned", f"<@{user_id}> ({user_id})\n**Reason:** {reason}", 0x00FF00)
+    return discord.Embed(
+        title="🔓 User Unbanned",
+        description=f"Unbanned <@{user_id}> for: {reason}",
+        color=0x00FF00).set_footer(text=footer_text)
+
+async def mute_member(responder, member, reason, duration=None):
+    if duration and not valid_duration(duration):
+        return INVALID_DURATION
+    role = await resolved.ensure_muted_role(member.guild)
+    await member.add_roles(role)
+    record_case(member.guild, member.id, responder.user, "mute", reason, duration)
+    until = ""
+    if duration:
+        expires_at = await schedule_expiry(member.guild, member.id, "unmute", duration)
+        until = f" until {discord.utils.format_dt(expires_at)}"
+    else:
+        await expiry_scheduler.cancel(member.guild.id, member.id, "unmute")
+    log_action(member.guild, responder.user, "🔇 User Muted", f"{member.mention} ({member.id}){until}\n**Reason:** {reason}", 0xFF0000)
+    return discord.Embed(
+        title="🔇 User Muted",
+        description=f"Muted {member.mention}{until} for: {reason}",
+        color=0xFF0000).set_footer(text=footer_text)
+
+async def unmute_member(responder, member):
+    role = resolved.muted_role(member.guild)
+    if role:
+        await member.remove_roles(role)
+    await expiry_scheduler.cancel(member.guild.id, member.id, "unmute")
+    record_case(member.guild, member.id, responder.user, "unmute")
+    log_action(member.guild, responder.user, "🔊 User Unmuted", f"{member.mention} ({member.id})", 0x00FF00)
+    return discord.Embed(
+        title="🔊 User Unmuted",
+        description=f"Unmuted {member.mention}",
+        color=0x00FF00).set_footer(text=footer_text)
+
+async def apply_timeout(member, duration, reason, moderator):
+    delta = parse_time(duration)
+    if delta > MAX_TIMEOUT:
+        raise ValueError("Timeouts can last at most 28 days; use mute with a duration instead.")
+    await member.timeout(delta, reason=reason)
+    record_case(member.guild, member.id, moderator, "timeout", reason, duration)
+    log_action(member.guild, moderator, "⏲️ User Timed Out",
+               f"{member.mention} ({member.id}) for {duration}\n**Reason:** {reason}", 0xFF0000)
+
+async def timeout_member(responder, member, duration, reason="No reason provided"):
+    if not valid_duration(duration):
+        return INVALID_DURATION
+    await apply_timeout(member, duration, reason, responder.user)
+    return discord.Embed(
+        title="⏲️ User Timed Out",
+        description=f"Timed out {member.mention} for {duration}. Reason: {reason}",
+        color=0xFF0000).set_footer(text=footer_text)
+
+async def untimeout_member(responder, member):
+    await member.timeout(None)
+    record_case(member.guild, member.id, responder.user, "untimeout")
+    log_action(member.guild, responder.user, "✅ User Untimed Out", f"{member.mention} ({member.id})", 0x00FF00)
+    return discord.Embed(
+        title="✅ User Untimed Out",
+        description=f"Removed timeout from {member.mention}.",
+        color=0x00FF00).set_footer(text=footer_text)
+
+# -------------------------------
+# Moderation cases
+# -------------------------------
+# Pages are fetched by case number, never OFFSET. Like /help, the history
+# buttons use fixed custom_ids and read where they are from the footer.
+CASE_ICONS = {"ban": "🔨", "kick": "👢", "unban": "🔓", "mute": "🔇", "unmute": "🔊",
+              "timeout": "⏲️", "untimeout": "✅"}
+HISTORY_PAGE_SIZE = case_settings.get("page_size", 10)
+HISTORY_FOOTER_RE = re.compile(r"^(User|Moderator) (\d+) • Page (\d+)/\d+ • Cases #(\d+)-#(\d+)")
+
+def describe_case(case, by_moderator):
+    who = f"on <@{case.user_id}>" if by_moderator else f"by <@{case.moderator_id}>"
+    line = f"**#{case.case_id}** {CASE_ICONS.get(case.action, '📝')} {case.action} {who} <t:{int(case.created_at)}:R>"
+    details = " ".join(part for part in (f"({case.duration})" if case.duration else "", (case.reason or "")[:200]) if part)
+    return f"{line}\n{details}" if details else line
+
+async def history_embed(guild, target_id, by_moderator, page, before=None, after=None):
+    filters = {"moderator_id": target_id} if by_moderator else {"user_id": target_id}
+    found = await case_store.history(guild.id, before=before, after=after, limit=HISTORY_PAGE_SIZE, **filters)
+    if not found:
+        return None
+    total = await case_store.count(guild.id, **filters)
+    pages = max(1, -(-total // HISTORY_PAGE_SIZE))
+    kind = "Moderator" if by_moderator else "User"
+    embed = discord.Embed(
+        title=f"📁 {'Actions by' if by_moderator else 'History of'} {target_id}",
+        description="\n".join(describe_case(case, by_moderator) for case in found),
+        color=0x3498DB)
+    return embed.set_footer(text=f"{kind} {target_id} • Page {page}/{pages} • Cases #{found[0].case_id}-#{found[-1].case_id}")
+
+class HistoryPaginator(View):
+    def __init__(self):
+        super().__init__(timeout=None)
+
+    async def turn(self, interaction: discord.Interaction, older):
+        if not interaction.permissions.moderate_members:
+            await interaction.response.send_message("⚠️ You need the Moderate Members permission.", ephemeral=True)
+            return
+        embed = interaction.message.embeds[0] if interaction.message and interaction.message.embeds else None
+        match = HISTORY_FOOTER_RE.match(embed.footer.text or "") if embed else None
+        if match is None:
+            await interaction.response.send_message("⚠️ This history message can't be paged.", ephemeral=True)
+            return
+        kind, target_id, page, newest, oldest = match.groups()
+        page = int(page) + (1 if older else -1)
+        embed = await history_embed(
+            interaction.guild, int(target_id), kind == "Moderator", page,
+            before=int(oldest) if older else None, after=None if older else int(newest))
+        if embed is None:
+            await interaction.response.send_message("There are no more cases that way.", ephemeral=True)
+            return
+        await interaction.response.edit_message(embed=embed)
+
+    @discord.ui.button(label="< Newer", style=discord.ButtonStyle.primary, custom_id="solarvox:history:newer")
+    async def newer_page(self, interaction: discord.Interaction, button: Button):
+        await self.turn(interaction, older=False)
+
+    @discord.ui.button(label="Older >", style=discord.ButtonStyle.primary, custom_id="solarvox:history:older")
+    async def older_page(self, interaction: discord.Interaction, button: Button):
+        await self.turn(interaction, older=True)
+
+# -------------------------------
+# Bulk Moderation (raids)
+# -------------------------------
+# Targets can be mentions/IDs, everyone who joined within a window, or an
+# uploaded file of IDs. Actions go through one scheduler that keeps each
+# route under its rate limit and retries 429s.
+
+async def collect_targets(interaction, targets, joined_within, id_file):
+    ids = set()
+    if targets:
+        ids.update(int(match) for match in SNOWFLAKE_RE.findall(targets))
+    if id_file:
+        data = await id_file.read()
+        ids.update(int(match) for match in SNOWFLAKE_RE.findall(data.decode("utf-8", "ignore")))
+    if joined_within:
+        since = discord.utils.utcnow() - parse_time(joined_within)
+        guild = interaction.guild
+        # Lean gateway mode keeps no member list; request it just this once.
+        members = guild.members if guild.chunked else await guild.chunk(cache=False)
+        ids.update(member.id for member in members
+                   if member.joined_at and member.joined_at >= since)
+    # Never act on the moderator, the bot or the owner
+    ids.difference_update({interaction.user.id, bot.user.id, interaction.guild.owner_id})
+    return sorted(ids)
+
+async def start_bulk(interaction, targets, joined_within, id_file):
+    await interaction.response.defer(thinking=True)
+    try:
+        return await collect_targets(interaction, targets, joined_within, id_file)
+    except (KeyError, ValueError):
+        await interaction.followup.send("⚠️ Invalid duration. Use a number followed by s, m, h, d or w (e.g. 10m).")
+        return None
+    except discord.ClientException:
+        await interaction.followup.send("⚠️ `joined_within` needs member events enabled (`member_events` in the gateway settings).")
+        return None
+
+# Anti-spam: message floods, repeated text and mass mentions per user.
+spam_settings = config.get("spam_limits", {})
+
+def might_be_spam(message):
+    if message.guild is None:
+        return False
+    settings = guild_store.get_cached(message.guild.id)
+    return settings is None or bool(settings["anti_spam"])
+
+def might_contain_link(message):
+    # Every link has a dot in it; skip servers whose cached policy is off.
+    if message.guild is None or "." not in message.content:
+        return False
+    policy = link_filter.cached(message.guild.id)
+    return policy is None or policy.active
+
+
+class Moderation(commands.Cog):
+    mass_group = app_commands.Group(
+        name="mass", description="Bulk moderation for raids.",
+        default_permissions=discord.Permissions(ban_members=True), guild_only=True)
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.bulk_scheduler = BulkScheduler(concurrency=4, limit=5, window=5.0)
+        self.spam_tracker = SpamTracker(
+            messages=spam_settings.get("messages", 5),
+            duplicates=spam_settings.get("duplicates", 3),
+            mentions=spam_settings.get("mentions", 10),
+            window=spam_settings.get("window", 5),
+            idle_after=spam_settings.get("idle_after", 300),
+            max_users=spam_settings.get("max_users", 5000))
+        self.history_view = None
+
+    async def cog_load(self):
+        self.history_view = HistoryPaginator()
+        self.bot.add_view(self.history_view)
+        message_pipeline.add_stage("anti_spam", STAGE_ANTI_SPAM, self.anti_spam_stage, might_be_spam)
+        message_pipeline.add_stage("anti_link", STAGE_ANTI_LINK, self.anti_link_stage, might_contain_link)
+        self.sweep_spam_tracker.start()
+
+    async def cog_unload(self):
+        self.sweep_spam_tracker.cancel()
+        message_pipeline.remove_stage("anti_spam")
+        message_pipeline.remove_stage("anti_link")
+        self.history_view.stop()
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.spam_tracker.forget_guild(guild.id)
+
+    @app_commands.command(name="ban", description="Ban a user from the server.")
+    @app_commands.describe(duration="Unban automatically after this long, e.g. 7d")
+    async def ban(self, interaction: discord.Interaction, member: discord.Member, reason: str = "No reason provided", duration: str = None):
+        await execute(interaction, ban_member, member, reason, duration)
+
+    @commands.command(name="ban")
+    async def ban_prefix(self, ctx, member: discord.Member, *, reason="No reason provided"):
+        duration, reason = split_duration(reason)
+        await execute(ctx, ban_member, member, reason, duration)
+
+    @app_commands.command(name="kick", description="Kick a user from the server.")
+    async def kick(self, interaction: discord.Interaction, member: discord.Member, reason: str = "No reason provided"):
+        await execute(interaction, kick_member, member, reason)
+
+    @commands.command(name="kick")
+    async def kick_prefix(self, ctx, member: discord.Member, *, reason="No reason provided"):
+        await execute(ctx, kick_member, member, reason)
+
+    @app_commands.command(name="unban", description="Unban a user from the server.")
+    async def unban(self, interaction: discord.Interaction, user_id: int, reason: str = "No reason provided"):
+        await execute(interaction, unban_member, user_id, reason)
+
+    @commands.command(name="unban")
+    async def unban_prefix(self, ctx, user_id: int, *, reason="No reason provided"):
+        await execute(ctx, unban_member, user_id, reason)
+
+    @app_commands.command(name="mute", description="Mute a user.")
+    @app_commands.describe(duration="Unmute automatically after this long, e.g. 2h")
+    async def mute(self, interaction: discord.Interaction, member: discord.Member, reason: str = "No reason provided", duration: str = None):
+        await execute(interaction, mute_member, member, reason, duration)
+
+    @commands.command(name="mute")
+    async def mute_prefix(self, ctx, member: discord.Member, *, reason="No reason provided"):
+        duration, reason = split_duration(reason)
+        await execute(ctx, mute_member, member, reason, duration)
+
+    @app_commands.command(name="unmute", description="Unmute a user.")
+    async def unmute(self, interaction: discord.Interaction, member: discord.Member):
+        await execute(interaction, unmute_member, member)
+
+    @commands.command(name="unmute")
+    async def unmute_prefix(self, ctx, member: discord.Member):
+        await execute(ctx, unmute_member, member)
+
+    @app_commands.command(name="timeout", description="Timeout a user for a specific duration.")
+    async def timeout(self, interaction: discord.Interaction, member: discord.Member, duration: str, reason: str = "No reason provided"):
+        await execute(interaction, timeout_member, member, duration, reason)
+
+    @commands.command(name="timeout")
+    async def timeout_prefix(self, ctx, member: discord.Member, duration: str, *, reason="No reason provided"):
+        await execute(ctx, timeout_member, member, duration, reason)
+
+    @app_commands.command(name="untimeout", description="Remove timeout from a user.")
+    async def untimeout(self, interaction: discord.Interaction, member: discord.Member):
+        await execute(interaction, untimeout_member, member)
+
+    @commands.command(name="untimeout")
+    async def untimeout_prefix(self, ctx, member: discord.Member):
+        await execute(ctx, untimeout_member, member)
+
+    @app_commands.command(name="history", description="Show a user's moderation cases.")
+    @app_commands.describe(user="Whose cases to show", as_moderator="Show the actions this user took as a moderator instead")
+    @app_commands.default_permissions(moderate_members=True)
+    @app_commands.guild_only()
+    async def history_cmd(self, interaction: discord.Interaction, user: discord.User, as_moderator: bool = False):
+        embed = await history_embed(interaction.guild, user.id, as_moderator, 1)
+        if embed is None:
+            await interaction.response.send_message(f"No moderation cases for {user.mention}.", ephemeral=True)
+            return
+        await interaction.response.send_message(embed=embed, view=self.history_view, ephemeral=True)
+
+    @app_commands.command(name="case", description="Show one moderation case.")
+    @app_commands.describe(number="Case number")
+    @app_commands.default_permissions(moderate_members=True)
+    @app_commands.guild_only()
+    async def case_cmd(self, interaction: discord.Interaction, number: int):
+        case = await case_store.get(interaction.guild.id, number)
+        if case is None:
+            await interaction.response.send_message(f"⚠️ There is no case #{number}.", ephemeral=True)
+            return
+        embed = discord.Embed(
+            title=f"{CASE_ICONS.get(case.action, '📝')} Case #{case.case_id}: {case.action}",
+            color=0x3498DB, timestamp=datetime.fromtimestamp(case.created_at, timezone.utc))
+        embed.add_field(name="User", value=f"<@{case.user_id}> ({case.user_id})")
+        embed.add_field(name="Moderator", value=f"<@{case.moderator_id}> ({case.moderator_id})")
+        if case.duration:
+            embed.add_field(name="Duration", value=case.duration)
+        embed.add_field(name="Reason", value=(case.reason or "No reason provided")[:1024], inline=False)
+        await interaction.response.send_message(embed=embed.set_footer(text=footer_text), ephemeral=True)
+
+    async def run_bulk_action(self, interaction, verb, user_ids, make_action, reason=None, duration=None):
+        if not user_ids:
+            await interaction.followup.send("⚠️ No members matched.")
+            return
+        jobs = [BulkJob(user_id, f"{verb}:{interaction.guild.id}", make_action(user_id)) for user_id in user_ids]
+        last_edit = 0.0
+        token_dead = False
+
+        async def show(**kwargs):
+            # Interaction tokens expire after 15 minutes, and a long run can
+            # outlive one; after that, progress stops and the summary goes to
+            # the channel instead.
+            nonlocal token_dead
+            if not token_dead:
+                try:
+                    await interaction.edit_original_response(**kwargs)
+                    return
+                except discord.HTTPException as e:
+                    token_dead = True
+                    print(f" Mass {verb} in {interaction.guild.id}: lost the interaction ({e}), reporting in channel")
+            if kwargs.get("embed") is not None:
+                try:
+                    await interaction.channel.send(embed=kwargs["embed"])
+                except discord.HTTPException as e:
+                    print(f" Mass {verb} in {interaction.guild.id}: could not send the summary: {e}")
+
+        async def report(result):
+            nonlocal last_edit
+            now = asyncio.get_running_loop().time()
+            if result.done < result.total and now - last_edit >= 2:
+                last_edit = now
+                await show(content=f"⏳ Mass {verb}: {result.done}/{result.total} done...")
+
+        await show(content=f"⏳ Mass {verb}: 0/{len(jobs)} done...")
+        result = await self.bulk_scheduler.run(jobs, on_progress=report)
+        for user_id in result.succeeded:
+            record_case(interaction.guild, user_id, interaction.user, verb, reason, duration)
+        log_action(interaction.guild, interaction.user, f"🧹 Mass {verb.capitalize()}",
+                   f"{len(result.succeeded)} succeeded, {len(result.failed)} failed", 0xFF0000)
+        embed = discord.Embed(
+            title=f"🧹 Mass {verb.capitalize()} Finished",
+            description=f"Succeeded: **{len(result.succeeded)}**\nFailed: **{len(result.failed)}**",
+            color=0xFF0000 if result.failed else 0x00FF00)
+        if result.failed:
+            failed = "\n".join(f"{user_id}: {error}" for user_id, error in list(result.failed.items())[:10])
+            embed.add_field(name="Failures", value=failed[:1024], inline=False)
+        await show(content=None, embed=embed.set_footer(text=footer_text))
+
+    @mass_group.command(name="ban", description="Ban many users at once.")
+    @app_commands.describe(targets="Mentions or IDs", joined_within="Everyone who joined in this window, e.g. 10m",
+                           id_file="Text file of user IDs")
+    async def mass_ban(self, interaction: discord.Interaction, targets: str = None, joined_within: str = None,
+                       id_file: discord.Attachment = None, reason: str = "No reason provided"):
+        user_ids = await start_bulk(interaction, targets, joined_within, id_file)
+        if user_ids is None:
+            return
+        guild = interaction.guild
+        await self.run_bulk_action(interaction, "ban", user_ids,
+                                   lambda user_id: lambda: guild.ban(discord.Object(id=user_id), reason=reason), reason)
+
+    @mass_group.command(name="kick", description="Kick many users at once.")
+    @app_commands.describe(targets="Mentions or IDs", joined_within="Everyone who joined in this window, e.g. 10m",
+                           id_file="Text file of user IDs")
+    async def mass_kick(self, interaction: discord.Interaction, targets: str = None, joined_within: str = None,
+                        id_file: discord.Attachment = None, reason: str = "No reason provided"):
+        user_ids = await start_bulk(interaction, targets, joined_within, id_file)
+        if user_ids is None:
+            return
+        guild = interaction.guild
+        await self.run_bulk_action(interaction, "kick", user_ids,
+                                   lambda user_id: lambda: guild.kick(discord.Object(id=user_id), reason=reason), reason)
+
+    @mass_group.command(name="timeout", description="Timeout many users at once.")
+    @app_commands.describe(duration="How long, e.g. 10m", targets="Mentions or IDs",
+                           joined_within="Everyone who joined in this window, e.g. 10m", id_file="Text file of user IDs")
+    async def mass_timeout(self, interaction: discord.Interaction, duration: str, targets: str = None,
+                           joined_within: str = None, id_file: discord.Attachment = None,
+                           reason: str = "No reason provided"):
+        # Check the duration before deferring or collecting targets.
+        try:
+            delta = parse_time(duration)
+        except (KeyError, ValueError):
+            await interaction.response.send_message(INVALID_DURATION, ephemeral=True)
+            return
+        if delta > MAX_TIMEOUT:
+            await interaction.response.send_message("⚠️ Timeouts can last at most 28 days.", ephemeral=True)
+            return
+        user_ids = await start_bulk(interaction, targets, joined_within, id_file)
+        if user_ids is None:
+            return
+        guild = interaction.guild
+
+        def make_action(user_id):
+            # The "timeout" budget covers the member edit; a fetch for an
+            # uncached member is a different Discord route, left to discord.py.
+            async def action():
+                member = await resolve_member(guild, user_id)
+                await member.timeout(delta, reason=reason)
+            return action
+
+        await self.run_bulk_action(interaction, "timeout", user_ids, make_action, reason, duration)
+
+    # Pipeline stages (registered in cog_load)
+    async def anti_spam_stage(self, message):
+        reason = self.spam_tracker.check(message.guild.id, message.author.id, message.content,
+                                         len(message.mentions) + len(message.role_mentions))
+        if reason is None:
+            return False
+        # Settings and permissions are only looked at once something trips.
+        author = message.author
+        if not (await guild_store.get(message.guild.id))["anti_spam"]:
+            return False
+        if not isinstance(author, discord.Member) or author.guild_permissions.manage_messages:
+            return False
+        self.spam_tracker.reset(message.guild.id, author.id)
+        duration = spam_settings.get("timeout", "10m")
+        try:
+            await apply_timeout(author, duration, f"Anti-spam: {reason}", self.bot.user)
+        except discord.HTTPException as e:
+            print(f" Could not time out {author} ({author.id}) in {message.guild.name}: {e}")
+            return False
+        await message.channel.send(embed=discord.Embed(
+            title="🚫 Anti-Spam Protection",
+            description=f"{author.mention} was timed out for {duration} ({reason}).",
+            color=0xFF0000).set_footer(text=footer_text))
+        return True
+
+    async def anti_link_stage(self, message):
+        settings = await guild_store.get(message.guild.id)
+        policy = link_filter.policy(message.guild.id, settings)
+        if not policy.active or policy.find_blocked(message.content) is None:
+            return False
+        # Exemptions are only worked out once a message actually has a blocked link.
+        author = message.author
+        if policy.exempt_roles and any(role.id in policy.exempt_roles for role in author.roles):
+            return False
+        if author.guild_permissions.administrator:
+            return False
+        await message.delete()
+        await message.channel.send(embed=discord.Embed(
+            title="🚫 Anti-Link Protection",
+            description=f"{message.author.mention}, links are not allowed!",
+            color=0xFF0000).set_footer(text=footer_text))
+        return True
+
+    @tasks.loop(minutes=5)
+    async def sweep_spam_tracker(self):
+        self.spam_tracker.sweep()
+
+
+async def setup(bot):
+    await bot.add_cog(Moderation(bot))
@@ -0,0 +1,90 @@
+"""
+Gary - SolarVox
+Trivia command and answer checking
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+"""
+
+import asyncio
+
+import discord
+from discord import app_commands
+from discord.ext import commands, tasks
+
+from trivia import ChannelSampler, QuestionBank, TriviaSessions
+from botcore import STAGE_TRIVIA, config, message_pipeline
+
+# Questions live in an external JSONL bank (see trivia.py) and are only read
+# when asked; each channel works through the bank without repeats.
+trivia_settings = config.get("trivia", {})
+
+
+class Trivia(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.bank = None
+        self.sampler = None
+        self.sessions = TriviaSessions(ttl=trivia_settings.get("timeout", 60))
+
+    async def cog_load(self):
+        # A changed bank means rebuilding its index, which takes seconds for
+        # a large one; do that off the event loop (also on C!reload trivia).
+        self.bank = await asyncio.get_running_loop().run_in_executor(
+            None, QuestionBank, trivia_settings.get("bank", "trivia_questions.jsonl"))
+        self.sampler = ChannelSampler(self.bank)
+        message_pipeline.add_stage("trivia", STAGE_TRIVIA, self.trivia_stage,
+                                   lambda message: self.sessions.is_live(message.channel.id))
+
+    async def cog_unload(self):
+        message_pipeline.remove_stage("trivia")
+        self.expire_trivia.cancel()
+        self.bank.close()
+
+    @app_commands.command(name="trivia", description="Answer a random trivia question.")
+    @app_commands.describe(category="Only ask questions from this category",
+                           difficulty="Only ask questions of this difficulty")
+    async def trivia(self, interaction: discord.Interaction, category: str = None, difficulty: str = None):
+        question_id = self.sampler.next_question(
+            interaction.channel_id,
+            category.lower() if category else None,
+            difficulty.lower() if difficulty else None)
+        if question_id is None:
+            await interaction.response.send_message("⚠️ No trivia questions match that category and difficulty.", ephemeral=True)
+            return
+        question, answer = self.bank.get(question_id)
+        self.sessions.start(interaction.channel_id, answer)
+        if not self.expire_trivia.is_running():
+            self.expire_trivia.start()
+        await interaction.response.send_message(f"❓ {question}\n*(Type your answer below, you have {int(self.sessions.ttl)} seconds)*")
+
+    @trivia.autocomplete("category")
+    async def category_autocomplete(self, interaction: discord.Interaction, current: str):
+        return [app_commands.Choice(name=category, value=category)
+                for category in self.bank.categories if current.lower() in category][:25]
+
+    @trivia.autocomplete("difficulty")
+    async def difficulty_autocomplete(self, interaction: discord.Interaction, current: str):
+        return [app_commands.Choice(name=difficulty, value=difficulty)
+                for difficulty in self.bank.difficulties if current.lower() in difficulty][:25]
+
+    @tasks.loop(seconds=5)
+    async def expire_trivia(self):
+        for channel_id, answer in self.sessions.expire():
+            channel = self.bot.get_channel(channel_id)
+            if channel:
+                await channel.send(f"⌛ Time's up! The answer was **{answer}**.")
+        if not len(self.sessions):
+            self.expire_trivia.stop()
+
+    async def trivia_stage(self, message):
+        answer = self.sessions.check(message.channel.id, message.content)
+        if answer is None:
+            return False
+        await message.channel.send(f"🎉 Correct, {message.author.mention}! The answer is **{answer}**.")
+        return True
+
+
+async def setup(bot):
+    await bot.add_cog(Trivia(bot))
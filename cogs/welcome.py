@@ -0,0 +1,85 @@
+"""
+Gary - SolarVox
+Welcome and leave messages
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+"""
+
+import discord
+from discord.ext import commands
+
+from batching import BurstCoalescer
+from welcome import TemplateCache, pack_lines, render
+from botcore import bot_metrics, config, footer_text, guild_store, resolved
+
+# One embed per member normally; during join/leave bursts members are
+# collected and listed together so the welcome channel isn't flooded.
+welcome_settings = config.get("welcome_batching", {})
+WELCOME_KINDS = {
+    "welcome_message": ("Welcome!", 0x00FF00),
+    "leave_message": ("Farewell!", 0xFF0000),
+}
+
+
+class Welcome(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.templates = TemplateCache()
+        self.queue = BurstCoalescer(
+            self.send_batch,
+            threshold=welcome_settings.get("threshold", 5),
+            window=welcome_settings.get("window", 10),
+            delay=welcome_settings.get("delay", 5),
+            max_batch=welcome_settings.get("max_batch", 100))
+
+    async def cog_load(self):
+        guild_store.add_listener(self.templates.invalidate)
+
+    async def cog_unload(self):
+        guild_store.remove_listener(self.templates.invalidate)
+        # Send whatever is still batched before the queue goes away.
+        await self.queue.close()
+
+    async def send_batch(self, key, lines):
+        guild_id, kind = key
+        guild = self.bot.get_guild(guild_id)
+        if guild is None:
+            return
+        channel = resolved.channel(guild, await guild_store.get_value(guild_id, "welcome_channel"))
+        if not channel:
+            return
+        title, color = WELCOME_KINDS[kind]
+        if len(lines) == 1:
+            await channel.send(embed=discord.Embed(title=title, description=lines[0], color=color).set_footer(text=footer_text))
+            return
+        embeds = [discord.Embed(title=f"{title} ({len(lines)} members)", description="\n".join(chunk), color=color)
+                  .set_footer(text=footer_text) for chunk in pack_lines(lines)]
+        per_message = max(1, min(10, welcome_settings.get("embeds_per_message", 1)))
+        for start in range(0, len(embeds), per_message):
+            await channel.send(embeds=embeds[start:start + per_message])
+
+    async def queue_welcome(self, guild, user, kind):
+        settings = await guild_store.get(guild.id)
+        if not resolved.channel(guild, settings["welcome_channel"]):
+            return
+        template = self.templates.get(guild.id, kind, settings[kind])
+        self.queue.push((guild.id, kind), render(template, user, guild))
+
+    @commands.Cog.listener()
+    @bot_metrics.instrument("on_member_join")
+    async def on_member_join(self, member):
+        await self.queue_welcome(member.guild, member, "welcome_message")
+
+    # The raw event also fires for members that aren't cached (lean gateway mode).
+    @commands.Cog.listener()
+    @bot_metrics.instrument("on_raw_member_remove")
+    async def on_raw_member_remove(self, payload):
+        guild = self.bot.get_guild(payload.guild_id)
+        if guild is not None:
+            await self.queue_welcome(guild, payload.user, "leave_message")
+
+
+async def setup(bot):
+    await bot.add_cog(Welcome(bot))
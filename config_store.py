@@ -0,0 +1,103 @@
+"""
+Gary - SolarVox
+Write-behind config persistence
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+
+
+class ConfigStore:
+    """Holds config.json in memory and writes it back in the background.
+
+    Changes only mark the store dirty. A flush task coalesces every change made
+    during one interval into a single write, which happens on a worker thread
+    through a temp file and an atomic rename so a crash never leaves a half
+    written config behind.
+    """
+
+    def __init__(self, path, flush_interval=5.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.data = self._load()
+        self._dirty = False
+        self._task = None
+        self._lock = None
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+
+    def mark_dirty(self):
+        self._dirty = True
+
+    @property
+    def dirty(self):
+        return self._dirty
+
+    def start(self):
+        """Start the background flush task on the running loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f" Error saving config: {e}")
+
+    async def flush(self):
+        """Write pending changes off the event loop, if there are any."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self._dirty:
+                return
+            # Serialise on the loop so the worker thread never sees the dict
+            # while a handler is mutating it.
+            payload = json.dumps(self.data, indent=4)
+            self._dirty = False
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self._write, payload)
+            except Exception:
+                self._dirty = True
+                raise
+
+    def flush_sync(self):
+        """Blocking flush for use once the event loop has stopped."""
+        if self._dirty:
+            self._write(json.dumps(self.data, indent=4))
+            self._dirty = False
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+    def _write(self, payload):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".config-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w") as file:
+                file.write(payload)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
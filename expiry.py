@@ -0,0 +1,129 @@
+"""
+Gary - SolarVox
+Persistent scheduler for temporary bans and mutes
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+"""
+
+import asyncio
+import heapq
+import time
+
+RETRY_DELAY = 300.0
+
+
+class ExpiryScheduler:
+    """Runs ``handler(guild_id, user_id, action)`` when a temporary action ends.
+
+    Deadlines are stored in SQLite and kept in memory in one heap, served by
+    a single task that sleeps until the earliest deadline (or until an
+    earlier one is scheduled). Rescheduling or cancelling only updates the
+    deadline table; stale heap entries are skipped when they come up. On
+    start every stored deadline is loaded again, so anything that expired
+    while the bot was down runs straight away.
+
+    The table lives in the case database and goes through the CaseStore's
+    connection and thread (``store.run_db``), so the store has to be started
+    first and closed after this.
+
+    ``owns(guild_id)`` limits a process to its own guilds when several
+    cluster workers share the file. A row is deleted once the handler
+    returns; if it raises, the action is retried after ``RETRY_DELAY``.
+    """
+
+    def __init__(self, store, handler, owns=lambda guild_id: True, clock=time.time):
+        self.store = store
+        self.handler = handler
+        self.owns = owns
+        self.clock = clock
+        self._heap = []
+        self._deadlines = {}
+        self._wake = None
+        self._task = None
+
+    def __len__(self):
+        return len(self._deadlines)
+
+    async def start(self):
+        self._wake = asyncio.Event()
+        rows = await self.store.run_db(_db_open)
+        for guild_id, user_id, action, expires_at in rows:
+            if self.owns(guild_id):
+                self._push((guild_id, user_id, action), expires_at)
+        self._task = asyncio.get_running_loop().create_task(self._serve())
+        return len(self._deadlines)
+
+    def _push(self, key, expires_at):
+        self._deadlines[key] = expires_at
+        heapq.heappush(self._heap, (expires_at, key))
+
+    async def schedule(self, guild_id, user_id, action, expires_at):
+        """Run ``action`` at ``expires_at`` (Unix time), replacing any earlier deadline."""
+        key = (guild_id, user_id, action)
+        await self.store.run_db(_db_upsert, key, expires_at)
+        self._push(key, expires_at)
+        self._wake.set()
+
+    async def cancel(self, guild_id, user_id, action):
+        key = (guild_id, user_id, action)
+        if self._deadlines.pop(key, None) is not None:
+            await self.store.run_db(_db_delete, key)
+
+    def deadline(self, guild_id, user_id, action):
+        return self._deadlines.get((guild_id, user_id, action))
+
+    async def _serve(self):
+        heap = self._heap
+        while True:
+            self._wake.clear()
+            # Drop entries that were cancelled or rescheduled.
+            while heap and self._deadlines.get(heap[0][1]) != heap[0][0]:
+                heapq.heappop(heap)
+            delay = heap[0][0] - self.clock() if heap else None
+            if delay is None or delay > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            expires_at, key = heapq.heappop(heap)
+            try:
+                await self.handler(*key)
+            except Exception as e:
+                print(f" Error running {key[2]} for user {key[1]} in guild {key[0]}: {e}")
+                if self._deadlines.get(key) == expires_at:
+                    self._push(key, self.clock() + RETRY_DELAY)
+                continue
+            if self._deadlines.get(key) == expires_at:
+                del self._deadlines[key]
+                try:
+                    await self.store.run_db(_db_delete, key)
+                except Exception as e:
+                    print(f" Error clearing expiry for user {key[1]} in guild {key[0]}: {e}")
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+# Blocking database side, run on the case store's thread. Its connection is in
+# autocommit mode, so each statement commits on its own.
+def _db_open(conn):
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS expiries ("
+        "guild_id INTEGER NOT NULL, user_id INTEGER NOT NULL, action TEXT NOT NULL, "
+        "expires_at REAL NOT NULL, PRIMARY KEY (guild_id, user_id, action)) WITHOUT ROWID"
+    )
+    return conn.execute("SELECT guild_id, user_id, action, expires_at FROM expiries").fetchall()
+
+def _db_upsert(conn, key, expires_at):
+    conn.execute(
+        "INSERT INTO expiries (guild_id, user_id, action, expires_at) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(guild_id, user_id, action) DO UPDATE SET expires_at = excluded.expires_at",
+        (*key, expires_at))
+
+def _db_delete(conn, key):
+    conn.execute("DELETE FROM expiries WHERE guild_id = ? AND user_id = ? AND action = ?", key)
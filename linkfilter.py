@@ -0,0 +1,141 @@
+"""
+Gary - SolarVox
+Per-guild link filter engine
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+"""
+
+import re
+
+# Bare domains only count as links when they end in one of these, so normal
+# text like "e.g." or "main.py" is left alone. Scheme and www. links match any TLD.
+COMMON_TLDS = (
+    "com", "net", "org", "io", "gg", "tv", "xyz", "ru", "de", "uk", "biz", "ly", "cc",
+    "fr", "nl", "eu", "ca", "au", "jp", "cn", "br", "pl", "gov", "edu",
+)
+# TLDs that are also everyday words: "thanks.it works" or "logged.in" is a
+# missing space, not a link. A bare domain ending in one of these (or in a TLD
+# only known from a guild's allow/deny list) counts when a path follows
+# ("example.me/x") or the guild denies it by name.
+WORD_TLDS = (
+    "co", "me", "us", "to", "in", "it", "es", "info", "app", "dev", "site", "online", "link",
+    "live", "shop", "store",
+)
+
+INVITE_RE = re.compile(r"(?:discord(?:app)?\.com/invite|discord\.gg|dsc\.gg)/[\w-]+", re.IGNORECASE)
+
+
+def _build_link_re(tlds):
+    label = r"[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?"
+    tld_group = "|".join(sorted({re.escape(tld) for tld in tlds}, key=len, reverse=True))
+    return re.compile(
+        r"(?:https?://|www\.)((?:" + label + r"\.)*" + label + r"\.[a-z]{2,63})"
+        r"|(?<![@\w.-])((?:" + label + r"\.)+(?:" + tld_group + r"))(?![\w-])",
+        re.IGNORECASE,
+    )
+
+
+_DEFAULT_LINK_RE = _build_link_re(COMMON_TLDS + WORD_TLDS)
+_BARE_TLDS = frozenset(COMMON_TLDS)
+
+
+def _domain_set(value):
+    if not value:
+        return frozenset()
+    if isinstance(value, str):
+        value = value.replace(",", " ").split()
+    return frozenset(domain.strip().lower().lstrip(".") for domain in value if domain.strip())
+
+
+SNOWFLAKE_RE = re.compile(r"\d{15,21}")
+
+
+def _id_set(value):
+    # Accepts bare IDs or mentions ("<@&123...>"); anything else is ignored.
+    if not value:
+        return frozenset()
+    if isinstance(value, (int, str)):
+        value = [value]
+    return frozenset(int(found) for item in value for found in SNOWFLAKE_RE.findall(str(item)))
+
+
+class LinkPolicy:
+    """Compiled link rules for one guild."""
+
+    __slots__ = ("block_all", "block_invites", "allow", "deny", "exempt_roles", "link_re")
+
+    def __init__(self, block_all, block_invites, allow, deny, exempt_roles):
+        self.block_all = block_all
+        self.block_invites = block_invites
+        self.allow = allow
+        self.deny = deny
+        self.exempt_roles = exempt_roles
+        extra_tlds = {domain.rsplit(".", 1)[-1] for domain in allow | deny if "." in domain}
+        if extra_tlds - set(COMMON_TLDS + WORD_TLDS):
+            self.link_re = _build_link_re(set(COMMON_TLDS + WORD_TLDS) | extra_tlds)
+        else:
+            self.link_re = _DEFAULT_LINK_RE
+
+    @property
+    def active(self):
+        return self.block_all or self.block_invites or bool(self.deny)
+
+    @staticmethod
+    def _listed(host, domains):
+        # Walk the host's parent domains: a.b.example.com, b.example.com, example.com, ...
+        while True:
+            if host in domains:
+                return True
+            dot = host.find(".")
+            if dot < 0:
+                return False
+            host = host[dot + 1:]
+
+    def find_blocked(self, content):
+        """Return the first blocked link in ``content``, or None."""
+        if self.block_invites:
+            match = INVITE_RE.search(content)
+            if match:
+                return match.group(0)
+        if not self.block_all and not self.deny:
+            return None
+        for match in self.link_re.finditer(content):
+            host = (match.group(1) or match.group(2)).lower()
+            if self.deny and self._listed(host, self.deny):
+                return host
+            if match.group(2) and host.rsplit(".", 1)[1] not in _BARE_TLDS and not content.startswith("/", match.end()):
+                continue
+            if self.block_all and not (self.allow and self._listed(host, self.allow)):
+                return host
+        return None
+
+
+class LinkFilter:
+    """Caches a compiled LinkPolicy per guild until its settings change."""
+
+    def __init__(self):
+        self._policies = {}
+
+    def policy(self, guild_id, settings):
+        policy = self._policies.get(guild_id)
+        if policy is None:
+            policy = LinkPolicy(
+                block_all=bool(settings.get("anti_link")),
+                block_invites=bool(settings.get("block_invites", settings.get("anti_link"))),
+                allow=_domain_set(settings.get("link_allow")),
+                deny=_domain_set(settings.get("link_deny")),
+                exempt_roles=_id_set(settings.get("link_exempt_roles")),
+            )
+            self._policies[guild_id] = policy
+        return policy
+
+    def cached(self, guild_id):
+        return self._policies.get(guild_id)
+
+    def invalidate(self, guild_id=None):
+        if guild_id is None:
+            self._policies.clear()
+        else:
+            self._policies.pop(guild_id, None)
@@ -0,0 +1,127 @@
+"""
+Gary - SolarVox
+Event-loop stall watchdog
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from time import perf_counter
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+ASYNCIO_DIR = os.path.dirname(asyncio.__file__)
+
+
+class Stall:
+    __slots__ = ("at", "duration", "handler", "where", "stack")
+
+    def __init__(self, at, duration, handler, where, stack):
+        self.at = at
+        self.duration = duration
+        self.handler = handler
+        self.where = where
+        self.stack = stack
+
+
+def blame(stack):
+    """``(handler, where)`` for a stack sampled from the loop thread.
+
+    Frames up to the last asyncio one are the loop itself. Of what the loop
+    was running, the outermost frame from this project is the event handler
+    or command, and the innermost is the line that was blocking.
+    """
+    start = 0
+    for index, frame in enumerate(stack):
+        if frame.filename.startswith(ASYNCIO_DIR):
+            start = index + 1
+    running = stack[start:]
+    ours = [frame for frame in running
+            if frame.filename.startswith(PROJECT_DIR) and frame.filename != __file__]
+    if not ours:
+        ours = running[-1:] or stack[-1:]
+    if not ours:
+        return "unknown", "unknown"
+    inner = ours[-1]
+    where = f"{os.path.relpath(inner.filename, PROJECT_DIR)}:{inner.lineno} in {inner.name}"
+    return ours[0].name, where
+
+
+class LoopWatchdog:
+    """Measures event-loop lag and captures what was running when it stalls.
+
+    A heartbeat task wakes every ``interval`` seconds and records how late it
+    was. A daemon thread checks the heartbeat; once it is more than
+    ``threshold`` seconds overdue, the thread grabs the loop thread's stack,
+    once per stall. When the loop comes back, the stall is logged with that
+    stack and kept in ``stalls``. Between stalls the cost is ten short wakeups
+    a second on each side.
+    """
+
+    def __init__(self, threshold=0.25, interval=0.1, keep=20, observe=None):
+        self.threshold = threshold
+        self.interval = interval
+        self.observe = observe
+        self.stalls = deque(maxlen=keep)
+        self.stall_count = 0
+        self.max_lag = 0.0
+        self._beat = None
+        self._sample = None
+        self._loop_thread = None
+        self._stopped = threading.Event()
+        self._task = None
+
+    def start(self, loop):
+        self._loop_thread = threading.get_ident()
+        self._stopped.clear()
+        self._task = loop.create_task(self._heartbeat())
+        threading.Thread(target=self._watch, name="solarvox-watchdog", daemon=True).start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _heartbeat(self):
+        while True:
+            beat = self._beat = perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, perf_counter() - beat - self.interval)
+            if self.observe is not None:
+                self.observe(lag)
+            if lag > self.max_lag:
+                self.max_lag = lag
+            if lag > self.threshold:
+                sample = self._sample
+                self._record(lag, sample[1] if sample and sample[0] == beat else None)
+
+    def _watch(self):
+        sampled = None
+        while not self._stopped.wait(self.interval / 2):
+            beat = self._beat
+            if beat is None or beat == sampled:
+                continue
+            if perf_counter() - beat - self.interval > self.threshold:
+                frame = sys._current_frames().get(self._loop_thread)
+                if frame is not None:
+                    self._sample = (beat, traceback.extract_stack(frame))
+                sampled = beat
+
+    def _record(self, lag, stack):
+        if stack is None:
+            # The loop recovered before the thread looked.
+            handler, where, lines = "unknown", "not sampled", []
+        else:
+            handler, where = blame(stack)
+            lines = traceback.format_list(stack[-15:])
+        self.stall_count += 1
+        self.stalls.append(Stall(time.time(), lag, handler, where, lines))
+        print(f" Event loop blocked for {lag * 1000:.0f}ms in {handler} ({where})")
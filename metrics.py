@@ -0,0 +1,225 @@
+"""
+Gary - SolarVox
+Lightweight metrics: latency histograms, counters and a Prometheus endpoint
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+"""
+
+import asyncio
+import functools
+import re
+from bisect import bisect_left
+from time import perf_counter
+
+# Seconds. Covers fast event handlers up to slow REST-heavy commands.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram; observing is a bisect and two adds."""
+
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds=DEFAULT_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Upper bucket bound holding the q-th observation (inf if past the last bound)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.bounds[index] if index < len(self.bounds) else float("inf")
+        return float("inf")
+
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+
+class Family:
+    """A named metric with one child per label value.
+
+    Children are created the first time a label value is seen and reused
+    afterwards, so recording never allocates once a command or route is warm.
+    """
+
+    def __init__(self, name, help_text, label, factory):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.factory = factory
+        self.children = {}
+
+    def child(self, label_value):
+        child = self.children.get(label_value)
+        if child is None:
+            child = self.children[label_value] = self.factory()
+        return child
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Registry:
+    def __init__(self):
+        self.histograms = []
+        self.counters = []
+        self.collectors = []
+
+    def histogram(self, name, help_text, label, bounds=DEFAULT_BUCKETS):
+        family = Family(name, help_text, label, lambda: Histogram(bounds))
+        self.histograms.append(family)
+        return family
+
+    def counter(self, name, help_text, label):
+        family = Family(name, help_text, label, Counter)
+        self.counters.append(family)
+        return family
+
+    def add_collector(self, collector):
+        """``collector()`` returns ``(name, help, label, {label_value: number})`` gauges at scrape time."""
+        self.collectors.append(collector)
+
+    def render(self):
+        """Prometheus text exposition format."""
+        lines = []
+        for family in self.counters:
+            lines.append(f"# HELP {family.name} {family.help_text}")
+            lines.append(f"# TYPE {family.name} counter")
+            for value, counter in family.children.items():
+                lines.append(f'{family.name}{{{family.label}="{_escape(value)}"}} {counter.value}')
+        for family in self.histograms:
+            lines.append(f"# HELP {family.name} {family.help_text}")
+            lines.append(f"# TYPE {family.name} histogram")
+            for value, hist in family.children.items():
+                label = f'{family.label}="{_escape(value)}"'
+                cumulative = 0
+                for bound, bucket_count in zip(hist.bounds, hist.counts):
+                    cumulative += bucket_count
+                    lines.append(f'{family.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+                lines.append(f'{family.name}_bucket{{{label},le="+Inf"}} {hist.count}')
+                lines.append(f"{family.name}_sum{{{label}}} {hist.total}")
+                lines.append(f"{family.name}_count{{{label}}} {hist.count}")
+        for collector in self.collectors:
+            for name, help_text, label, values in collector():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} gauge")
+                for value, number in values.items():
+                    lines.append(f'{name}{{{label}="{_escape(value)}"}} {number}')
+        return "\n".join(lines) + "\n"
+
+
+class BotMetrics:
+    """The bot's metric families plus helpers to record into them."""
+
+    def __init__(self):
+        self.registry = Registry()
+        self.command_latency = self.registry.histogram(
+            "solarvox_command_seconds", "Command run time.", "command")
+        self.command_errors = self.registry.counter(
+            "solarvox_command_errors_total", "Commands that raised.", "command")
+        self.event_latency = self.registry.histogram(
+            "solarvox_event_seconds", "Event handler run time.", "event")
+        self.event_errors = self.registry.counter(
+            "solarvox_event_errors_total", "Event handlers that raised.", "event")
+        self.rest_calls = self.registry.counter(
+            "solarvox_rest_requests_total", "Outbound REST requests.", "route")
+        self.rest_429s = self.registry.counter(
+            "solarvox_rest_ratelimited_total", "Outbound REST requests answered with 429.", "route")
+        self.rest_latency = self.registry.histogram(
+            "solarvox_rest_seconds", "Outbound REST request time.", "route")
+
+    def instrument(self, event_name):
+        """Decorator timing an event handler coroutine and counting its errors."""
+        def decorator(func):
+            hist = self.event_latency.child(event_name)
+            errors = self.event_errors.child(event_name)
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                except Exception:
+                    errors.value += 1
+                    raise
+                finally:
+                    hist.observe(perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def http_trace(self):
+        """aiohttp TraceConfig counting REST calls and 429s per route."""
+        import aiohttp
+
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            ctx.start = perf_counter()
+
+        async def on_request_end(session, ctx, params):
+            route = route_key(params.method, params.url.path)
+            self.rest_calls.child(route).value += 1
+            self.rest_latency.child(route).observe(perf_counter() - ctx.start)
+            if params.response.status == 429:
+                self.rest_429s.child(route).value += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_end.append(on_request_end)
+        return trace
+
+
+_SNOWFLAKE_RE = re.compile(r"/\d{15,21}(?=/|$)")
+_TOKEN_RE = re.compile(r"(/(?:webhooks|interactions)/\{id\})/[^/]+")
+
+
+def route_key(method, path):
+    """``GET /api/v10/guilds/123/bans/456`` -> ``GET /guilds/{id}/bans/{id}``."""
+    path = _SNOWFLAKE_RE.sub("/{id}", path)
+    path = _TOKEN_RE.sub(r"\1/{token}", path)
+    if path.startswith("/api/v"):
+        path = path[path.find("/", 5):]
+    return f"{method} {path}"
+
+
+async def serve(registry, host="127.0.0.1", port=9108):
+    """Serve ``/metrics`` over plain HTTP on a local port."""
+
+    async def handle(reader, writer):
+        try:
+            request = await asyncio.wait_for(reader.readline(), timeout=5)
+            while (await asyncio.wait_for(reader.readline(), timeout=5)) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                status, body = "200 OK", registry.render().encode("utf-8")
+            else:
+                status, body = "404 Not Found", b"not found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body)
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
@@ -0,0 +1,72 @@
+"""
+Gary - SolarVox
+Buffered moderation-log sink
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+"""
+
+import io
+
+import discord
+
+from batching import BurstCoalescer
+
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+
+class LogFile:
+    """A log entry sent as a text attachment with a summary embed."""
+
+    __slots__ = ("embed", "filename", "text")
+
+    def __init__(self, embed, filename, text):
+        self.embed = embed
+        self.filename = filename
+        self.text = text
+
+
+class LogSink:
+    """Buffers log embeds per guild and sends them packed into few messages.
+
+    Entries wait at most ``interval`` seconds (or until ``max_batch`` are
+    queued) and then go out with up to 10 embeds per message. Large entries
+    such as purge transcripts are sent as file attachments.
+    """
+
+    def __init__(self, resolve_channel, interval=2.0, max_batch=50):
+        self.resolve_channel = resolve_channel
+        self._queue = BurstCoalescer(self._flush, threshold=0, window=interval, delay=interval, max_batch=max_batch)
+
+    def log(self, guild_id, embed):
+        self._queue.push(guild_id, embed)
+
+    def log_file(self, guild_id, embed, filename, text):
+        self._queue.push(guild_id, LogFile(embed, filename, text))
+
+    async def _flush(self, guild_id, items):
+        channel = await self.resolve_channel(guild_id)
+        if channel is None:
+            return
+        embeds, size = [], 0
+        for item in items:
+            if isinstance(item, LogFile):
+                if embeds:
+                    await channel.send(embeds=embeds)
+                    embeds, size = [], 0
+                file = discord.File(io.BytesIO(item.text.encode("utf-8")), filename=item.filename)
+                await channel.send(embed=item.embed, file=file)
+                continue
+            length = len(item)
+            if embeds and (len(embeds) >= MAX_EMBEDS_PER_MESSAGE or size + length > MAX_EMBED_CHARS_PER_MESSAGE):
+                await channel.send(embeds=embeds)
+                embeds, size = [], 0
+            embeds.append(item)
+            size += length
+        if embeds:
+            await channel.send(embeds=embeds)
+
+    async def close(self):
+        await self._queue.close()
@@ -0,0 +1,92 @@
+"""
+Gary - SolarVox
+Ordered message-processing pipeline
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+"""
+
+from time import perf_counter_ns
+
+
+class Stage:
+    """One step of the pipeline plus its running timings."""
+
+    __slots__ = ("name", "order", "handler", "precheck", "calls", "handled", "total_ns", "max_ns")
+
+    def __init__(self, name, order, handler, precheck=None):
+        self.name = name
+        self.order = order
+        self.handler = handler
+        self.precheck = precheck
+        self.calls = 0
+        self.handled = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+
+class MessagePipeline:
+    """Runs every incoming message through registered stages in order.
+
+    A stage's ``precheck`` is a plain function that gets the message and
+    returns False to skip the stage. It should only look at attributes that
+    are already there (author.bot, channel id, the first characters of the
+    content). The stage handler is a coroutine. If it returns True the message
+    counts as handled and later stages are skipped. Only handler runs are
+    timed.
+    """
+
+    def __init__(self):
+        self._stages = []
+
+    @property
+    def stages(self):
+        return tuple(self._stages)
+
+    def stage(self, name, order, precheck=None):
+        """Decorator that registers a coroutine as a pipeline stage."""
+        def decorator(handler):
+            self.add_stage(name, order, handler, precheck)
+            return handler
+        return decorator
+
+    def add_stage(self, name, order, handler, precheck=None):
+        if any(stage.name == name for stage in self._stages):
+            raise ValueError(f"Pipeline stage already registered: {name}")
+        self._stages.append(Stage(name, order, handler, precheck))
+        self._stages.sort(key=lambda stage: stage.order)
+
+    def remove_stage(self, name):
+        self._stages = [stage for stage in self._stages if stage.name != name]
+
+    async def process(self, message):
+        """Run the stages for a message; return the name of the stage that handled it."""
+        for stage in self._stages:
+            if stage.precheck is not None and not stage.precheck(message):
+                continue
+            start = perf_counter_ns()
+            try:
+                handled = await stage.handler(message)
+            finally:
+                elapsed = perf_counter_ns() - start
+                stage.calls += 1
+                stage.total_ns += elapsed
+                if elapsed > stage.max_ns:
+                    stage.max_ns = elapsed
+            if handled:
+                stage.handled += 1
+                return stage.name
+        return None
+
+    def stats(self):
+        """Per-stage ``(name, calls, handled, avg_ms, max_ms)`` in run order."""
+        return [
+            (stage.name, stage.calls, stage.handled,
+             stage.total_ns / stage.calls / 1e6 if stage.calls else 0.0, stage.max_ns / 1e6)
+            for stage in self._stages
+        ]
+
+    def reset_stats(self):
+        for stage in self._stages:
+            stage.calls = stage.handled = stage.total_ns = stage.max_ns = 0
@@ -0,0 +1,87 @@
+"""
+Gary - SolarVox
+Per-guild cache of resolved roles and channels
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+"""
+
+import asyncio
+
+import discord
+
+_MISSING = object()
+
+
+class GuildObjects:
+    __slots__ = ("muted_role", "channels", "role_lock")
+
+    def __init__(self):
+        self.muted_role = _MISSING
+        self.channels = {}
+        self.role_lock = asyncio.Lock()
+
+
+class ResolvedCache:
+    """Remembers the Muted role and configured channels for each guild.
+
+    Lookups that found nothing are cached too, so a missing log channel does
+    not cost a lookup on every event. Role and channel events drop the
+    affected entries.
+    """
+
+    def __init__(self, muted_role_name="Muted"):
+        self.muted_role_name = muted_role_name
+        self._guilds = {}
+
+    def _entry(self, guild_id):
+        entry = self._guilds.get(guild_id)
+        if entry is None:
+            entry = self._guilds[guild_id] = GuildObjects()
+        return entry
+
+    def channel(self, guild, channel_id):
+        if not channel_id:
+            return None
+        channels = self._entry(guild.id).channels
+        channel = channels.get(channel_id, _MISSING)
+        if channel is _MISSING:
+            channel = channels[channel_id] = guild.get_channel(channel_id)
+        return channel
+
+    def muted_role(self, guild):
+        entry = self._entry(guild.id)
+        if entry.muted_role is _MISSING:
+            entry.muted_role = discord.utils.get(guild.roles, name=self.muted_role_name)
+        return entry.muted_role
+
+    async def ensure_muted_role(self, guild):
+        """Return the Muted role, creating it once even if several mutes race."""
+        role = self.muted_role(guild)
+        if role is not None:
+            return role
+        entry = self._entry(guild.id)
+        async with entry.role_lock:
+            role = self.muted_role(guild)
+            if role is None:
+                role = await guild.create_role(
+                    name=self.muted_role_name, permissions=discord.Permissions(send_messages=False))
+                entry.muted_role = role
+        return role
+
+    def invalidate_role(self, role):
+        entry = self._guilds.get(role.guild.id)
+        if entry is None:
+            return
+        cached = entry.muted_role
+        if role.name == self.muted_role_name or (cached is not _MISSING and cached is not None and cached.id == role.id):
+            entry.muted_role = _MISSING
+
+    def invalidate_channel(self, channel):
+        entry = self._guilds.get(channel.guild.id)
+        if entry is not None:
+            entry.channels.pop(channel.id, None)
+
+    def forget_guild(self, guild_id):
+        self._guilds.pop(guild_id, None)
@@ -0,0 +1,75 @@
+"""
+Gary - SolarVox
+One response path for slash and prefix commands
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+"""
+
+import asyncio
+
+import discord
+
+
+class Responder:
+    """Answers a command whether it came in as an Interaction or a Context.
+
+    Slash commands have to be acknowledged within three seconds. ``defer()``
+    does that (the user sees "thinking...") and the reply then goes out as
+    a follow-up. Prefix commands have no deadline, so ``defer()`` does
+    nothing for them and the reply is a normal channel message.
+    """
+
+    __slots__ = ("source", "interaction")
+
+    def __init__(self, source):
+        self.source = source
+        self.interaction = source if isinstance(source, discord.Interaction) else None
+
+    @property
+    def user(self):
+        return self.interaction.user if self.interaction is not None else self.source.author
+
+    @property
+    def guild(self):
+        return self.source.guild
+
+    async def defer(self, ephemeral=False):
+        if self.interaction is not None and not self.interaction.response.is_done():
+            await self.interaction.response.defer(thinking=True, ephemeral=ephemeral)
+
+    async def send(self, reply, ephemeral=False):
+        """Send a string or an Embed."""
+        kwargs = {"embed": reply} if isinstance(reply, discord.Embed) else {"content": reply}
+        if self.interaction is None:
+            return await self.source.send(**kwargs)
+        if self.interaction.response.is_done():
+            return await self.interaction.followup.send(ephemeral=ephemeral, **kwargs)
+        return await self.interaction.response.send_message(ephemeral=ephemeral, **kwargs)
+
+
+async def execute(source, action, *args, ephemeral=False):
+    """Run ``action(responder, *args)`` for a command and send what it returns.
+
+    A slash command is acknowledged as soon as it arrives, and that request
+    runs while the action makes its own API calls, so a slow ban or role
+    edit never runs into the interaction deadline. The action returns the
+    reply (a string or an Embed), or None when it has nothing to say.
+    Discord errors and ValueErrors are shown to the user. Anything else is
+    re-raised for the usual error handlers once the user has been told.
+    """
+    responder = Responder(source)
+    ack = asyncio.ensure_future(responder.defer(ephemeral))
+    try:
+        reply = await action(responder, *args)
+    except (discord.HTTPException, ValueError) as e:
+        reply = f"⚠️ Error: {e}"
+    except Exception:
+        await ack
+        if responder.interaction is not None:
+            await responder.send("⚠️ Something went wrong running that command.", ephemeral)
+        raise
+    await ack
+    if reply is not None:
+        await responder.send(reply, ephemeral)
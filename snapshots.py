@@ -0,0 +1,127 @@
+"""
+Gary - SolarVox
+Compact message snapshots for delete/edit logging
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+"""
+
+from collections import OrderedDict, deque
+
+# Rough per-snapshot cost on top of the text: the record, its index entry
+# and ring slot, and the str/tuple headers.
+SNAPSHOT_OVERHEAD = 250
+
+
+class MessageSnapshot:
+    """What delete/edit logging needs from a message, and nothing else."""
+
+    __slots__ = ("id", "author_id", "channel_id", "content", "attachments", "size")
+
+    def __init__(self, message_id, author_id, channel_id, content, attachments):
+        self.id = message_id
+        self.author_id = author_id
+        self.channel_id = channel_id
+        self.content = content
+        self.attachments = attachments
+        self.size = SNAPSHOT_OVERHEAD + len(content) + sum(len(url) for url in attachments)
+
+
+class _ChannelRing:
+    __slots__ = ("order", "index")
+
+    def __init__(self):
+        self.order = deque()
+        self.index = {}
+
+
+class SnapshotCache:
+    """Recent message snapshots, bounded per channel and in total.
+
+    Each channel keeps its last ``per_channel`` messages in arrival order.
+    Content is cut to ``max_content`` characters. When the estimated total
+    passes ``budget`` bytes, the oldest snapshots of the least recently
+    active channels go first, so quiet channels can't crowd out busy ones.
+    Deleted snapshots leave a hole in their ring that is skipped once it
+    rotates out.
+    """
+
+    def __init__(self, per_channel=500, budget=16 * 2**20, max_content=1000):
+        self.per_channel = per_channel
+        self.budget = budget
+        self.max_content = max_content
+        self.used = 0
+        self._count = 0
+        self._channels = OrderedDict()
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def channels(self):
+        return len(self._channels)
+
+    def add(self, message_id, author_id, channel_id, content, attachments=()):
+        snapshot = MessageSnapshot(message_id, author_id, channel_id, content[:self.max_content], tuple(attachments))
+        ring = self._channels.get(channel_id)
+        if ring is None:
+            ring = self._channels[channel_id] = _ChannelRing()
+        else:
+            self._channels.move_to_end(channel_id)
+        old = ring.index.get(message_id)
+        if old is not None:
+            self._forget(old)
+        ring.order.append(snapshot)
+        ring.index[message_id] = snapshot
+        self.used += snapshot.size
+        self._count += 1
+        while len(ring.order) > self.per_channel:
+            self._drop_oldest(ring)
+        while self.used > self.budget:
+            quiet_id, quiet = next(iter(self._channels.items()))
+            if not quiet.order:
+                del self._channels[quiet_id]
+                continue
+            self._drop_oldest(quiet)
+        return snapshot
+
+    def _forget(self, snapshot):
+        self.used -= snapshot.size
+        self._count -= 1
+
+    def _drop_oldest(self, ring):
+        snapshot = ring.order.popleft()
+        if ring.index.get(snapshot.id) is snapshot:
+            del ring.index[snapshot.id]
+            self._forget(snapshot)
+
+    def get(self, channel_id, message_id):
+        ring = self._channels.get(channel_id)
+        return ring.index.get(message_id) if ring is not None else None
+
+    def pop(self, channel_id, message_id):
+        """Remove and return a snapshot (for deletes), or None if it isn't held."""
+        ring = self._channels.get(channel_id)
+        snapshot = ring.index.pop(message_id, None) if ring is not None else None
+        if snapshot is not None:
+            self._forget(snapshot)
+        return snapshot
+
+    def update(self, channel_id, message_id, content):
+        """Store edited content and return the previous content, or None if not held."""
+        snapshot = self.get(channel_id, message_id)
+        if snapshot is None:
+            return None
+        before = snapshot.content
+        content = content[:self.max_content]
+        snapshot.content = content
+        snapshot.size += len(content) - len(before)
+        self.used += len(content) - len(before)
+        return before
+
+    def forget_channel(self, channel_id):
+        ring = self._channels.pop(channel_id, None)
+        if ring is not None:
+            for snapshot in ring.index.values():
+                self._forget(snapshot)
@@ -0,0 +1,330 @@
+"""
+Gary - SolarVox
+Per-guild storage backends
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+"""
+
+import asyncio
+import copy
+import json
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class StorageBackend:
+    """Base class for guild config backends.
+
+    Subclasses implement the blocking ``_db_*`` methods. They are only ever
+    called from this backend's worker threads, so the event loop never waits
+    on the database. Writes are queued and committed in batches.
+    """
+
+    workers = 1
+
+    def __init__(self, flush_interval=2.0):
+        self.flush_interval = flush_interval
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="solarvox-db")
+        self._pending = {}
+        self._task = None
+        self._lock = None
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def start(self):
+        self._lock = asyncio.Lock()
+        await self._run(self._db_open)
+        self._task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def fetch(self, guild_id):
+        if guild_id in self._pending:
+            return json.loads(self._pending[guild_id])
+        raw = await self._run(self._db_fetch, guild_id)
+        return json.loads(raw) if raw is not None else None
+
+    def queue_write(self, guild_id, data):
+        self._pending[guild_id] = json.dumps(data)
+
+    async def insert_missing(self, rows):
+        """Insert ``(guild_id, data)`` rows, leaving existing guilds untouched.
+
+        Returns the IDs that were actually inserted. Guilds with a queued
+        write already count as stored.
+        """
+        rows = [(guild_id, json.dumps(data)) for guild_id, data in rows if guild_id not in self._pending]
+        if not rows:
+            return []
+        return await self._run(self._db_insert_missing, rows)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f" Error writing guild storage: {e}")
+
+    async def flush(self):
+        async with self._lock:
+            if not self._pending:
+                return
+            rows = list(self._pending.items())
+            self._pending = {}
+            try:
+                await self._run(self._db_upsert_many, rows)
+            except Exception:
+                for guild_id, raw in rows:
+                    self._pending.setdefault(guild_id, raw)
+                raise
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        try:
+            await self.flush()
+        finally:
+            await self._run(self._db_close)
+            self._executor.shutdown(wait=False)
+
+    # Blocking database hooks
+    def _db_open(self):
+        raise NotImplementedError
+
+    def _db_fetch(self, guild_id):
+        raise NotImplementedError
+
+    def _db_upsert_many(self, rows):
+        raise NotImplementedError
+
+    def _db_insert_missing(self, rows):
+        raise NotImplementedError
+
+    def _db_close(self):
+        pass
+
+
+class SQLiteBackend(StorageBackend):
+    """Default backend: a local SQLite file in WAL mode on one worker thread."""
+
+    def __init__(self, path="solarvox.db", flush_interval=2.0):
+        super().__init__(flush_interval)
+        self.path = path
+        self._conn = None
+
+    def _db_open(self):
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS guild_config ("
+            "guild_id INTEGER PRIMARY KEY, data TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _db_fetch(self, guild_id):
+        row = self._conn.execute("SELECT data FROM guild_config WHERE guild_id = ?", (guild_id,)).fetchone()
+        return row[0] if row else None
+
+    def _db_upsert_many(self, rows):
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO guild_config (guild_id, data) VALUES (?, ?) "
+                "ON CONFLICT(guild_id) DO UPDATE SET data = excluded.data",
+                rows,
+            )
+
+    def _db_insert_missing(self, rows):
+        inserted = []
+        with self._conn:
+            for row in rows:
+                cursor = self._conn.execute("INSERT OR IGNORE INTO guild_config (guild_id, data) VALUES (?, ?)", row)
+                if cursor.rowcount:
+                    inserted.append(row[0])
+        return inserted
+
+    def _db_close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class MySQLBackend(StorageBackend):
+    """Optional MariaDB/MySQL backend using a connection pool.
+
+    Needs ``mysql-connector-python``. Each worker thread borrows a pooled
+    connection per batch, so queries never run on the event loop.
+    """
+
+    def __init__(self, host="localhost", user="root", password="", database="solarvox_db",
+                 port=3306, pool_size=4, flush_interval=2.0):
+        self.workers = pool_size
+        super().__init__(flush_interval)
+        self._params = dict(host=host, user=user, password=password, database=database, port=port)
+        self._pool_size = pool_size
+        self._pool = None
+
+    def _db_open(self):
+        from mysql.connector import pooling
+
+        self._pool = pooling.MySQLConnectionPool(
+            pool_name="solarvox", pool_size=self._pool_size, **self._params
+        )
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS guild_config ("
+            "guild_id BIGINT UNSIGNED PRIMARY KEY, data TEXT NOT NULL)"
+        )
+
+    def _execute(self, query, args=None, many=False, fetch=False):
+        conn = self._pool.get_connection()
+        try:
+            cursor = conn.cursor()
+            if many:
+                cursor.executemany(query, args)
+            else:
+                cursor.execute(query, args or ())
+            result = cursor.fetchall() if fetch else None
+            cursor.close()
+            if not fetch:
+                conn.commit()
+            return result
+        finally:
+            conn.close()
+
+    def _db_fetch(self, guild_id):
+        rows = self._execute("SELECT data FROM guild_config WHERE guild_id = %s", (guild_id,), fetch=True)
+        return rows[0][0] if rows else None
+
+    def _db_upsert_many(self, rows):
+        self._execute(
+            "INSERT INTO guild_config (guild_id, data) VALUES (%s, %s) "
+            "ON DUPLICATE KEY UPDATE data = VALUES(data)",
+            rows, many=True,
+        )
+
+    def _db_insert_missing(self, rows):
+        # Look up only the requested IDs, in chunks, then insert the rest.
+        existing = set()
+        for start in range(0, len(rows), 1000):
+            chunk = [guild_id for guild_id, _ in rows[start:start + 1000]]
+            existing.update(row[0] for row in self._execute(
+                f"SELECT guild_id FROM guild_config WHERE guild_id IN ({', '.join(['%s'] * len(chunk))})",
+                chunk, fetch=True))
+        missing = [row for row in rows if row[0] not in existing]
+        if missing:
+            self._execute("INSERT IGNORE INTO guild_config (guild_id, data) VALUES (%s, %s)", missing, many=True)
+        return [guild_id for guild_id, _ in missing]
+
+
+class GuildStore:
+    """Per-guild settings with an LRU read cache in front of a backend.
+
+    With ``cache_size`` left as None the cache is sized by ``fit_to()`` to
+    the guilds this process serves, so a cluster worker with thousands of
+    guilds doesn't keep evicting settings it needs on the next message.
+    """
+
+    MIN_CACHE_SIZE = 1000
+
+    def __init__(self, backend, defaults, cache_size=None):
+        self.backend = backend
+        self.defaults = defaults
+        self.auto_size = cache_size is None
+        self.cache_size = cache_size or self.MIN_CACHE_SIZE
+        self._cache = OrderedDict()
+        self._listeners = []
+
+    def __len__(self):
+        return len(self._cache)
+
+    def add_listener(self, callback):
+        """Call ``callback(guild_id, key)`` whenever a guild setting changes."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _remember(self, guild_id, data):
+        self._cache[guild_id] = data
+        self._cache.move_to_end(guild_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def fit_to(self, guild_count):
+        """Grow an automatically sized cache to hold ``guild_count`` guilds, with headroom."""
+        if self.auto_size:
+            self.cache_size = max(self.cache_size, guild_count + guild_count // 4)
+
+    def get_cached(self, guild_id):
+        """Return a guild's settings only if they are already in memory."""
+        data = self._cache.get(guild_id)
+        if data is not None:
+            self._cache.move_to_end(guild_id)
+        return data
+
+    async def get(self, guild_id):
+        data = self.get_cached(guild_id)
+        if data is None:
+            stored = await self.backend.fetch(guild_id)
+            # Another caller may have loaded (and changed) it during the fetch.
+            cached = self.get_cached(guild_id)
+            if cached is not None:
+                return cached
+            data = copy.deepcopy(self.defaults)
+            if stored:
+                data.update(stored)
+            self._remember(guild_id, data)
+        return data
+
+    async def get_value(self, guild_id, key, default=None):
+        return (await self.get(guild_id)).get(key, default)
+
+    async def set(self, guild_id, key, value):
+        data = await self.get(guild_id)
+        data[key] = value
+        self.backend.queue_write(guild_id, data)
+        for callback in self._listeners:
+            callback(guild_id, key)
+
+    async def ensure_many(self, guild_ids):
+        """Give every guild without stored settings the defaults, in one batch.
+
+        Only the given IDs are looked at; returns the ones that were added.
+        """
+        return await self.backend.insert_missing([(guild_id, self.defaults) for guild_id in guild_ids])
+
+    async def migrate_from_config(self, config):
+        """Move per-guild sections out of config.json into the backend.
+
+        Returns True when something was moved, so the caller can save the
+        trimmed config. Guilds already present in the backend keep their data.
+        """
+        guild_keys = [key for key in config if key.isdigit() and isinstance(config[key], dict)]
+        if not guild_keys:
+            return False
+        await self.backend.insert_missing([(int(key), config[key]) for key in guild_keys])
+        for key in guild_keys:
+            del config[key]
+        return True
+
+    async def start(self):
+        await self.backend.start()
+
+    async def close(self):
+        await self.backend.close()
+
+
+def create_backend(settings):
+    """Build a backend from the ``storage`` section of config.json."""
+    settings = settings or {}
+    kind = settings.get("backend", "sqlite").lower()
+    if kind == "sqlite":
+        return SQLiteBackend(settings.get("sqlite_path", "solarvox.db"))
+    if kind in ("mysql", "mariadb"):
+        return MySQLBackend(**settings.get("mysql", {}))
+    raise ValueError(f"Unknown storage backend: {kind}")
@@ -0,0 +1,287 @@
+"""
+Gary - SolarVox
+Trivia question bank, no-repeat sampling and per-channel sessions
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+"""
+
+import json
+import mmap
+import os
+import random
+import string
+import struct
+import tempfile
+import time
+from array import array
+
+_STRIP_CHARS = string.whitespace + string.punctuation
+
+INDEX_MAGIC = b"SVTQIDX1"
+
+
+def normalize_answer(text):
+    """Fold an answer so "  mount   everest!" matches "Mount Everest"."""
+    return " ".join(text.casefold().split()).strip(_STRIP_CHARS)
+
+
+class QuestionBank:
+    """A JSONL question file read lazily through a compact offset index.
+
+    Each line of the bank is ``{"question", "answer", "category", "difficulty"}``.
+    A sidecar ``<bank>.idx`` file holds, for every question, its byte offset
+    plus small category and difficulty ids. It is built once and rebuilt only
+    when the bank file changes. Both files are memory-mapped, so startup time
+    and memory use stay flat no matter how big the bank gets. Questions are
+    only parsed when they are asked.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = path + ".idx"
+        stat = os.stat(path)
+        if not self._index_is_current(stat):
+            self._build_index(stat)
+        self._open()
+        self._pools = {}
+
+    # Index file layout: magic, header length (uint32), JSON header, padding
+    # to 8 bytes, then offsets (count + 1 uint64), category ids (count uint16)
+    # and difficulty ids (count uint8), in native byte order since the index
+    # is a local cache rebuilt from the bank.
+    def _read_header(self, buffer):
+        if buffer[:8] != INDEX_MAGIC:
+            return None, 0
+        (length,) = struct.unpack_from("<I", buffer, 8)
+        header = json.loads(bytes(buffer[12:12 + length]))
+        return header, (12 + length + 7) & ~7
+
+    def _index_is_current(self, stat):
+        try:
+            with open(self.index_path, "rb") as file:
+                head = file.read(12)
+                head += file.read(struct.unpack_from("<I", head, 8)[0])
+                header, _ = self._read_header(head)
+        except (OSError, ValueError, struct.error):
+            return False
+        return bool(header) and header["source_size"] == stat.st_size and header["source_mtime_ns"] == stat.st_mtime_ns
+
+    def _build_index(self, stat):
+        offsets = array("Q")
+        category_ids = array("H")
+        difficulty_ids = array("B")
+        categories, difficulties = {}, {}
+        with open(self.path, "rb") as file:
+            offset = 0
+            for line in file:
+                if line.strip():
+                    entry = json.loads(line)
+                    category = str(entry.get("category", "general")).lower()
+                    difficulty = str(entry.get("difficulty", "medium")).lower()
+                    offsets.append(offset)
+                    category_ids.append(categories.setdefault(category, len(categories)))
+                    difficulty_ids.append(difficulties.setdefault(difficulty, len(difficulties)))
+                offset += len(line)
+            count = len(offsets)
+            offsets.append(offset)
+        header = json.dumps({
+            "source_size": stat.st_size,
+            "source_mtime_ns": stat.st_mtime_ns,
+            "count": count,
+            "categories": list(categories),
+            "difficulties": list(difficulties),
+        }).encode("utf-8")
+        start = (12 + len(header) + 7) & ~7
+        directory = os.path.dirname(os.path.abspath(self.index_path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".trivia-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(INDEX_MAGIC + struct.pack("<I", len(header)) + header)
+                file.write(b"\0" * (start - 12 - len(header)))
+                for part in (offsets, category_ids, difficulty_ids):
+                    file.write(part.tobytes())
+            os.replace(tmp_path, self.index_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _open(self):
+        with open(self.index_path, "rb") as file:
+            self._index_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(self.path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            self._data_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        header, start = self._read_header(self._index_map)
+        self.count = header["count"]
+        self.categories = header["categories"]
+        self.difficulties = header["difficulties"]
+        view = self._view = memoryview(self._index_map)
+        end = start + (self.count + 1) * 8
+        self._offsets = view[start:end].cast("Q")
+        self._category_ids = view[end:end + self.count * 2].cast("H")
+        end += self.count * 2
+        self._difficulty_ids = view[end:end + self.count].cast("B")
+
+    def __len__(self):
+        return self.count
+
+    def get(self, question_id):
+        """Return ``(question, answer)`` for a question id."""
+        start, end = self._offsets[question_id], self._offsets[question_id + 1]
+        entry = json.loads(self._data_map[start:end])
+        return entry["question"], entry["answer"]
+
+    def pool(self, category=None, difficulty=None):
+        """Question ids matching the filters, or None for the whole bank.
+
+        Filtered pools are built on first use (4 bytes per matching question)
+        and cached.
+        """
+        if category is None and difficulty is None:
+            return None
+        key = (category, difficulty)
+        pool = self._pools.get(key)
+        if pool is None:
+            if (category is not None and category not in self.categories) or \
+                    (difficulty is not None and difficulty not in self.difficulties):
+                return array("I")
+            category_id = self.categories.index(category) if category is not None else None
+            difficulty_id = self.difficulties.index(difficulty) if difficulty is not None else None
+            categories, difficulties = self._category_ids, self._difficulty_ids
+            pool = self._pools[key] = array("I", (
+                question_id for question_id in range(self.count)
+                if (category_id is None or categories[question_id] == category_id)
+                and (difficulty_id is None or difficulties[question_id] == difficulty_id)))
+        return pool
+
+    def close(self):
+        self._offsets.release()
+        self._category_ids.release()
+        self._difficulty_ids.release()
+        self._view.release()
+        self._index_map.close()
+        if self._data_map:
+            self._data_map.close()
+
+
+class ShuffledCycle:
+    """Walks ``range(size)`` in a random order without storing the order.
+
+    A 4-round Feistel network over the next even power of two is a random
+    permutation defined only by its keys; cycle-walking keeps results below
+    ``size``. Every index comes up once before any repeats, and the state is
+    a handful of integers whatever the size.
+    """
+
+    __slots__ = ("size", "position", "_half_bits", "_mask", "_keys")
+
+    def __init__(self, size, rng=random):
+        self.size = size
+        self.position = 0
+        self._half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+        self._mask = (1 << self._half_bits) - 1
+        self._keys = tuple(rng.getrandbits(32) for _ in range(4))
+
+    def _permute(self, value):
+        mask, half = self._mask, self._half_bits
+        left, right = value >> half, value & mask
+        for key in self._keys:
+            mixed = ((right ^ key) * 0x9E3779B1) & 0xFFFFFFFF
+            mixed ^= mixed >> 15
+            left, right = right, left ^ (mixed & mask)
+        return (left << half) | right
+
+    def next(self):
+        """Return the next index, or None once every index has been used."""
+        if self.position >= self.size:
+            return None
+        value = self._permute(self.position)
+        while value >= self.size:
+            value = self._permute(value)
+        self.position += 1
+        return value
+
+
+class ChannelSampler:
+    """Per-channel no-repeat sampling over the bank or a filtered pool."""
+
+    def __init__(self, bank, rng=random):
+        self.bank = bank
+        self.rng = rng
+        self._cycles = {}
+
+    def next_question(self, channel_id, category=None, difficulty=None):
+        """Pick a question id, or None when no question matches the filters."""
+        pool = self.bank.pool(category, difficulty)
+        size = len(self.bank) if pool is None else len(pool)
+        if not size:
+            return None
+        key = (channel_id, category, difficulty)
+        cycle = self._cycles.get(key)
+        if cycle is None or cycle.size != size:
+            cycle = self._cycles[key] = ShuffledCycle(size, self.rng)
+        index = cycle.next()
+        if index is None:
+            # Every question has been asked here; start a new order.
+            cycle = self._cycles[key] = ShuffledCycle(size, self.rng)
+            index = cycle.next()
+        return index if pool is None else pool[index]
+
+
+class TriviaSession:
+    __slots__ = ("answer", "answer_key", "expires_at")
+
+    def __init__(self, answer, answer_key, expires_at):
+        self.answer = answer
+        self.answer_key = answer_key
+        self.expires_at = expires_at
+
+
+class TriviaSessions:
+    """Live trivia questions, one per channel, each with a deadline.
+
+    The answer is normalised once when the question is asked, so checking a
+    message is a single normalise-and-compare.
+    """
+
+    def __init__(self, ttl=60.0, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self._sessions = {}
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def start(self, channel_id, answer):
+        self._sessions[channel_id] = TriviaSession(answer, normalize_answer(answer), self.clock() + self.ttl)
+
+    def is_live(self, channel_id):
+        session = self._sessions.get(channel_id)
+        return session is not None and session.expires_at > self.clock()
+
+    def check(self, channel_id, text):
+        """Return the answer if ``text`` answers this channel's question.
+
+        A correct answer ends the session. Wrong answers leave it running.
+        """
+        session = self._sessions.get(channel_id)
+        if session is None or session.expires_at <= self.clock():
+            return None
+        if normalize_answer(text) != session.answer_key:
+            return None
+        del self._sessions[channel_id]
+        return session.answer
+
+    def expire(self):
+        """Remove expired sessions and return ``(channel_id, answer)`` pairs."""
+        now = self.clock()
+        expired = [(channel_id, session.answer)
+                   for channel_id, session in self._sessions.items() if session.expires_at <= now]
+        for channel_id, _ in expired:
+            del self._sessions[channel_id]
+        return expired
@@ -0,0 +1,76 @@
+"""
+Gary - SolarVox
+Welcome/leave templates
+
+Copyright (c) 2025 SolarVox Development
+
+Licensed under the MIT License. See LICENSE file for details.
+"""
+
+import re
+
+_PLACEHOLDER_RE = re.compile(r"\{(user(?:\.name|\.mention)?|guild\.name|member_count)\}")
+
+_FIELDS = {
+    "user.mention": lambda user, guild: user.mention,
+    "user.name": lambda user, guild: user.name,
+    "guild.name": lambda user, guild: guild.name,
+    "member_count": lambda user, guild: str(guild.member_count),
+}
+
+
+def compile_template(text, user_field="user.mention"):
+    """Split a message template into literal strings and field getters.
+
+    Supported placeholders: ``{user}``, ``{user.name}``, ``{user.mention}``,
+    ``{guild.name}`` and ``{member_count}``. ``{user}`` maps to ``user_field``.
+    Anything else in braces is kept as written.
+    """
+    parts = []
+    pos = 0
+    for match in _PLACEHOLDER_RE.finditer(text):
+        if match.start() > pos:
+            parts.append(text[pos:match.start()])
+        field = match.group(1)
+        parts.append(_FIELDS[user_field if field == "user" else field])
+        pos = match.end()
+    if pos < len(text):
+        parts.append(text[pos:])
+    return tuple(parts)
+
+
+def render(template, user, guild):
+    return "".join(part if isinstance(part, str) else part(user, guild) for part in template)
+
+
+class TemplateCache:
+    """Compiled welcome/leave templates per guild."""
+
+    # Setting key -> what {user} means in it
+    USER_FIELDS = {"welcome_message": "user.mention", "leave_message": "user.name"}
+
+    def __init__(self):
+        self._templates = {}
+
+    def get(self, guild_id, key, text):
+        template = self._templates.get((guild_id, key))
+        if template is None:
+            template = self._templates[(guild_id, key)] = compile_template(text, self.USER_FIELDS[key])
+        return template
+
+    def invalidate(self, guild_id, key=None):
+        for name in ((key,) if key else self.USER_FIELDS):
+            self._templates.pop((guild_id, name), None)
+
+
+def pack_lines(lines, max_lines=20, max_chars=4000):
+    """Group lines into embed-sized chunks."""
+    chunk, size = [], 0
+    for line in lines:
+        if chunk and (len(chunk) >= max_lines or size + len(line) + 1 > max_chars):
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(line[:max_chars])
+        size += len(line) + 1
+    if chunk:
+        yield chunk